@@ -0,0 +1,53 @@
+"""Shared pytest setup for the root-level test scripts."""
+
+import os
+import sys
+from functools import lru_cache
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+
+def load_regexgen_api():
+    """Import the regexgen classes the tests use and return them by name."""
+    from regexgen.algorithms.simulated_annealing import SimulatedAnnealing, SAConfig
+    from regexgen.scoring.fitness import MultiCriteriaScorer, ScoringMode
+    from regexgen.validation.validator import PatternValidator
+    from regexgen.patterns.mutations import PatternMutator
+    from regexgen.patterns.analysis import PatternAnalyzer
+    
+    return SimpleNamespace(
+        SimulatedAnnealing=SimulatedAnnealing,
+        SAConfig=SAConfig,
+        MultiCriteriaScorer=MultiCriteriaScorer,
+        ScoringMode=ScoringMode,
+        PatternValidator=PatternValidator,
+        PatternMutator=PatternMutator,
+        PatternAnalyzer=PatternAnalyzer,
+    )
+
+
+@lru_cache(maxsize=None)
+def shared_scorer(mode):
+    """The MultiCriteriaScorer for a scoring mode, built once per process.
+    
+    Scorers only cache results keyed by regex and examples, so tests can
+    share one; optimizers keep their own random state.
+    """
+    from regexgen.scoring.fitness import MultiCriteriaScorer
+    return MultiCriteriaScorer(mode=mode)
+
+
+@lru_cache(maxsize=None)
+def shared_validator():
+    """A PatternValidator built once per process; its caches are keyed by examples."""
+    from regexgen.validation.validator import PatternValidator
+    return PatternValidator()
+
+
+@pytest.fixture(scope="session")
+def regexgen_api():
+    """regexgen classes, imported once per test session (or xdist worker)."""
+    return load_regexgen_api()
@@ -0,0 +1,228 @@
+"""Parallel tempering (replica exchange) variant of simulated annealing."""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Callable, Dict, Tuple
+
+from regexgen.algorithms.simulated_annealing import SAConfig, SAResult, SimulatedAnnealing
+from regexgen.patterns.ast import PatternAST
+from regexgen.scoring.fitness import FitnessScorer, FitnessResult
+
+
+@dataclass(frozen=True, slots=True)
+class PTConfig(SAConfig):
+    """Configuration for parallel tempering."""
+    num_replicas: int = 4
+    swap_every: int = 10  # Metropolis steps per replica between swap attempts
+
+
+@dataclass(slots=True)
+class _Replica:
+    """State of one tempering chain; the temperature stays fixed, states swap."""
+    temperature: float
+    pattern: PatternAST
+    fitness: FitnessResult
+
+
+class ParallelTemperingSA(SimulatedAnnealing):
+    """Replica-exchange optimizer for regex patterns.
+    
+    Runs ``num_replicas`` chains at fixed temperatures spaced geometrically
+    between the initial and final temperature. After every ``swap_every`` steps,
+    adjacent replicas exchange states with the Metropolis swap probability
+    ``min(1, exp((1/Ti - 1/Tj) * (Ei - Ej)))``, where the energy is the negated
+    fitness score. The best state seen by the coldest chain is returned.
+    
+    Sweeps run one replica after another: the shared random state and the
+    short regex matches used here don't benefit from threads.
+    """
+    
+    def __init__(self, config: PTConfig = None):
+        super().__init__(config or PTConfig())
+    
+    def replica_temperatures(self) -> List[float]:
+        """Temperatures for each replica, from hottest to coldest."""
+        num_replicas = max(1, self.config.num_replicas)
+        if num_replicas == 1:
+            return [self.config.final_temperature]
+        
+        ratio = (self.config.final_temperature / self.config.initial_temperature) ** (
+            1.0 / (num_replicas - 1)
+        )
+        return [self.config.initial_temperature * ratio ** k for k in range(num_replicas)]
+    
+    def optimize(
+        self,
+        positive_examples: List[str],
+        negative_examples: List[str],
+        fitness_scorer: FitnessScorer,
+        initial_pattern: Optional[PatternAST] = None,
+        early_stop: Optional[Callable[[FitnessResult], bool]] = None
+    ) -> SAResult:
+        """Run parallel tempering.
+        
+        The temperature and fitness histories hold one entry per sweep for the
+        coldest replica. ``early_stop`` is checked once per new best state,
+        after the sweep that found it, as in ``SimulatedAnnealing.optimize``.
+        """
+        start_time = time.monotonic()
+        
+        # Start every replica from the same pattern; mutation never edits its
+        # input, so replicas and the best state can share pattern objects
+        if initial_pattern is None:
+            initial_pattern = self.mutator.generate_random_pattern(
+                max_complexity=self.config.max_complexity // 2,
+                examples=positive_examples
+            )
+        else:
+            initial_pattern = initial_pattern.clone()
+        initial_fitness = fitness_scorer.score(initial_pattern, positive_examples, negative_examples)
+        
+        replicas = [
+            _Replica(temperature=temperature, pattern=initial_pattern, fitness=initial_fitness)
+            for temperature in self.replica_temperatures()
+        ]
+        coldest = replicas[-1]
+        
+        fitness_cache: Dict[str, FitnessResult] = {}
+        best_pattern = initial_pattern
+        best_fitness = initial_fitness
+        
+        temperature_history = []
+        fitness_history = []
+        accepted_moves = 0
+        rejected_moves = 0
+        no_improvement_count = 0
+        iteration = 0
+        convergence_reason = "max_iterations"
+        stop_checked = None  # Best fitness last passed to early_stop
+        
+        while iteration < self.config.max_iterations:
+            # Check timeout
+            if self.config.timeout_seconds and (time.monotonic() - start_time) > self.config.timeout_seconds:
+                convergence_reason = "timeout"
+                break
+            
+            steps = min(max(1, self.config.swap_every), self.config.max_iterations - iteration)
+            improved = False
+            
+            for replica in replicas:
+                accepted, rejected, sweep_pattern, sweep_fitness = self._sweep(
+                    replica, steps, positive_examples, negative_examples, fitness_scorer, fitness_cache
+                )
+                accepted_moves += accepted
+                rejected_moves += rejected
+                
+                if replica is coldest and sweep_fitness.total_score > best_fitness.total_score:
+                    best_pattern = sweep_pattern
+                    best_fitness = sweep_fitness
+                    improved = True
+            
+            iteration += steps
+            
+            # Exchange states between neighbouring temperatures; a swap may hand
+            # the coldest replica a better state than it found on its own
+            self._attempt_swaps(replicas)
+            if coldest.fitness.total_score > best_fitness.total_score:
+                best_pattern = coldest.pattern
+                best_fitness = coldest.fitness
+                improved = True
+            
+            no_improvement_count = 0 if improved else no_improvement_count + steps
+            
+            temperature_history.append(coldest.temperature)
+            fitness_history.append(coldest.fitness.total_score)
+            
+            # Check for early convergence
+            if no_improvement_count >= self.config.max_no_improvement:
+                convergence_reason = "no_improvement"
+                break
+            
+            # Check if we found a perfect solution
+            if (best_fitness.total_score >= 0.999 and
+                best_fitness.positive_matches == len(positive_examples) and
+                best_fitness.negative_matches == len(negative_examples)):
+                convergence_reason = "perfect_solution"
+                break
+            if early_stop is not None and best_fitness is not stop_checked:
+                stop_checked = best_fitness
+                if early_stop(best_fitness):
+                    convergence_reason = "early_stop"
+                    break
+        
+        total_time = time.monotonic() - start_time
+        
+        return SAResult(
+            best_pattern=best_pattern,
+            best_fitness=best_fitness,
+            iterations=iteration,
+            time_seconds=total_time,
+            temperature_history=temperature_history,
+            fitness_history=fitness_history,
+            accepted_moves=accepted_moves,
+            rejected_moves=rejected_moves,
+            convergence_reason=convergence_reason,
+            final_temperature=coldest.temperature
+        )
+    
+    def _sweep(
+        self,
+        replica: _Replica,
+        steps: int,
+        positive_examples: List[str],
+        negative_examples: List[str],
+        fitness_scorer: FitnessScorer,
+        fitness_cache: Dict[str, FitnessResult]
+    ) -> Tuple[int, int, PatternAST, FitnessResult]:
+        """Run ``steps`` Metropolis steps on one replica at its fixed temperature.
+        
+        Returns the accepted and rejected move counts and the best state visited.
+        """
+        accepted = 0
+        rejected = 0
+        sweep_pattern = replica.pattern
+        sweep_fitness = replica.fitness
+        
+        for _ in range(steps):
+            candidates = [
+                self.mutator.mutate(replica.pattern)
+                for _ in range(self.config.neighbors_per_iteration)
+            ]
+            candidates = [c for c in candidates if c.complexity() <= self.config.max_complexity]
+            if not candidates:
+                rejected += 1
+                continue
+            
+            candidate_fitness = self._score_candidates(
+                candidates, positive_examples, negative_examples, fitness_scorer, fitness_cache
+            )
+            best_index = max(range(len(candidates)), key=lambda i: candidate_fitness[i].total_score)
+            
+            if self._should_accept(
+                replica.fitness.total_score,
+                candidate_fitness[best_index].total_score,
+                replica.temperature
+            ):
+                replica.pattern = candidates[best_index]
+                replica.fitness = candidate_fitness[best_index]
+                accepted += 1
+                
+                if replica.fitness.total_score > sweep_fitness.total_score:
+                    sweep_pattern = replica.pattern
+                    sweep_fitness = replica.fitness
+            else:
+                rejected += 1
+        
+        return accepted, rejected, sweep_pattern, sweep_fitness
+    
+    def _attempt_swaps(self, replicas: List[_Replica]) -> None:
+        """Attempt Metropolis state swaps between adjacent replicas."""
+        for hot, cold in zip(replicas, replicas[1:]):
+            # Energy is the negated score, so (Ei - Ej) = (score_j - score_i)
+            log_ratio = (1.0 / hot.temperature - 1.0 / cold.temperature) * (
+                cold.fitness.total_score - hot.fitness.total_score
+            )
+            if log_ratio >= 0 or math.log(1.0 - self._rng.random()) < log_ratio:
+                hot.pattern, cold.pattern = cold.pattern, hot.pattern
+                hot.fitness, cold.fitness = cold.fitness, hot.fitness
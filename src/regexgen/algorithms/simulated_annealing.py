@@ -1,10 +1,15 @@
 """Simulated Annealing algorithm for regex pattern optimization."""
 
 import math
+import os
 import random
 import time
-from dataclasses import dataclass
-from typing import List, Optional, Callable, Dict, Any
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import List, Optional, Callable, Dict, Any, Deque, Sequence
 from enum import Enum
 
 # import numpy as np  # Optional for now
@@ -14,15 +19,20 @@ from regexgen.patterns.mutations import PatternMutator
 from regexgen.scoring.fitness import FitnessScorer, FitnessResult, ScoringMode
 
 
+# Number of recent moves used to estimate the acceptance rate
+ACCEPTANCE_WINDOW = 50
+
+
 class CoolingSchedule(Enum):
     """Different cooling schedules for simulated annealing."""
     LINEAR = "linear"
     EXPONENTIAL = "exponential"
     LOGARITHMIC = "logarithmic"
     ADAPTIVE = "adaptive"
+    ACCEPTANCE_ADAPTIVE = "acceptance_adaptive"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SAConfig:
     """Configuration for Simulated Annealing algorithm."""
     initial_temperature: float = 10.0  # Lower for more focused search
@@ -34,17 +44,21 @@ class SAConfig:
     max_complexity: int = 50
     random_seed: Optional[int] = None
     timeout_seconds: Optional[float] = None
+    fitness_cache_size: int = 4096  # Max memoized fitness results per run (0 disables)
+    neighbors_per_iteration: int = 1  # Candidates proposed and batch-scored per step
+    prune_margin: Optional[float] = 5.0  # Early-exit scoring this many T below current
+    moves_per_temperature: int = 1  # Metropolis steps run at each temperature level
 
 
-@dataclass
+@dataclass(slots=True)
 class SAResult:
     """Result from simulated annealing optimization."""
     best_pattern: PatternAST
     best_fitness: FitnessResult
     iterations: int
     time_seconds: float
-    temperature_history: List[float]
-    fitness_history: List[float]
+    temperature_history: Sequence[float]
+    fitness_history: Sequence[float]
     accepted_moves: int
     rejected_moves: int
     convergence_reason: str
@@ -63,9 +77,22 @@ class TemperatureScheduler:
         # For adaptive cooling
         self.last_improvement_iteration = 0
         self.stagnation_threshold = max(50, config.max_iterations // 20)
+        
+        # For acceptance-adaptive cooling (state is reset at iteration 0)
+        self._current_temp = self.initial_temp
+        self._reheated_for: Optional[int] = None
     
-    def get_temperature(self, iteration: int, last_improvement_iter: int = 0) -> float:
-        """Get temperature for given iteration."""
+    def get_temperature(
+        self,
+        iteration: int,
+        last_improvement_iter: int = 0,
+        acceptance_rate: Optional[float] = None
+    ) -> float:
+        """Get temperature for given iteration.
+        
+        ``acceptance_rate`` is the recent fraction of accepted moves; only the
+        acceptance-adaptive schedule uses it.
+        """
         if self.config.cooling_schedule == CoolingSchedule.LINEAR:
             return self._linear_cooling(iteration)
         elif self.config.cooling_schedule == CoolingSchedule.EXPONENTIAL:
@@ -74,6 +101,8 @@ class TemperatureScheduler:
             return self._logarithmic_cooling(iteration)
         elif self.config.cooling_schedule == CoolingSchedule.ADAPTIVE:
             return self._adaptive_cooling(iteration, last_improvement_iter)
+        elif self.config.cooling_schedule == CoolingSchedule.ACCEPTANCE_ADAPTIVE:
+            return self._acceptance_adaptive_cooling(iteration, last_improvement_iter, acceptance_rate)
         else:
             return self._exponential_cooling(iteration)
     
@@ -105,6 +134,60 @@ class TemperatureScheduler:
             base_temp *= slowdown_factor
         
         return max(base_temp, self.final_temp)
+    
+    def _acceptance_adaptive_cooling(
+        self,
+        iteration: int,
+        last_improvement_iter: int,
+        acceptance_rate: Optional[float]
+    ) -> float:
+        """Cooling whose rate follows the recent acceptance ratio.
+        
+        Starts from the exponential schedule's per-step rate, cools more slowly
+        while few moves are accepted (< 20%) and faster while nearly all are
+        (> 80%). Once the search has stagnated for half of ``max_no_improvement``
+        the temperature is doubled, once per stagnation period, to escape the
+        current basin.
+        """
+        if iteration == 0:
+            self._current_temp = self.initial_temp
+            self._reheated_for = None
+            return self._current_temp
+        
+        cooling_rate = (self.final_temp / self.initial_temp) ** (1.0 / self.max_iterations)
+        if acceptance_rate is not None:
+            if acceptance_rate < 0.2:
+                cooling_rate **= 0.5
+            elif acceptance_rate > 0.8:
+                cooling_rate **= 2
+        temperature = self._current_temp * cooling_rate
+        
+        # Energy-barrier re-heating
+        stagnation_time = iteration - last_improvement_iter
+        if (stagnation_time > self.config.max_no_improvement // 2 and
+                self._reheated_for != last_improvement_iter):
+            temperature *= 2
+            self._reheated_for = last_improvement_iter
+        
+        self._current_temp = min(max(temperature, self.final_temp), self.initial_temp)
+        return self._current_temp
+
+
+def _run_restart(
+    optimizer_class: type,
+    config: SAConfig,
+    seed: int,
+    positive_examples: List[str],
+    negative_examples: List[str],
+    fitness_scorer: FitnessScorer
+) -> SAResult:
+    """Run one independent chain (module-level so worker processes can pickle it).
+    
+    ``optimizer_class`` is the class restarting, so subclasses such as
+    parallel tempering restart as themselves rather than as plain SA.
+    """
+    optimizer = optimizer_class(replace(config, random_seed=seed))
+    return optimizer.optimize(positive_examples, negative_examples, fitness_scorer)
 
 
 class SimulatedAnnealing:
@@ -112,22 +195,32 @@ class SimulatedAnnealing:
     
     def __init__(self, config: SAConfig = None):
         self.config = config or SAConfig()
-        self.mutator = PatternMutator(mutation_rate=self.config.mutation_rate)
         self.scheduler = TemperatureScheduler(self.config)
         
+        # Dedicated generator for the acceptance test; the mutator gets its own,
+        # seeded from this one so the two streams differ
+        self._rng = random.Random(self.config.random_seed)
+        mutator_seed = None
         if self.config.random_seed is not None:
-            random.seed(self.config.random_seed)
-            # np.random.seed(self.config.random_seed)  # Optional
+            mutator_seed = self._rng.randrange(2 ** 32)
+        self.mutator = PatternMutator(mutation_rate=self.config.mutation_rate, seed=mutator_seed)
     
     def optimize(
         self,
         positive_examples: List[str],
         negative_examples: List[str],
         fitness_scorer: FitnessScorer,
-        initial_pattern: Optional[PatternAST] = None
+        initial_pattern: Optional[PatternAST] = None,
+        early_stop: Optional[Callable[[FitnessResult], bool]] = None
     ) -> SAResult:
-        """Run simulated annealing optimization."""
-        start_time = time.time()
+        """Run simulated annealing optimization.
+        
+        ``early_stop``, if given, is called with the initial fitness and then
+        with each new best fitness; the run ends (reason ``"early_stop"``) as
+        soon as it returns True, e.g.
+        ``FitnessResult.is_perfect`` to stop once every example is right.
+        """
+        start_time = time.monotonic()
         
         # Initialize current solution
         if initial_pattern is None:
@@ -140,46 +233,101 @@ class SimulatedAnnealing:
         
         current_fitness = fitness_scorer.score(current_pattern, positive_examples, negative_examples)
         
-        # Initialize best solution
-        best_pattern = current_pattern.clone()
+        # Memoize fitness by regex string; the examples are fixed for this run,
+        # so equivalent neighbors revisited during the search skip re-matching.
+        fitness_cache: Dict[str, FitnessResult] = {}
+        
+        # Initialize best solution. PatternMutator.mutate never edits its input,
+        # so patterns reached by the search can be kept by reference.
+        best_pattern = current_pattern
         best_fitness = current_fitness
         
         # Tracking variables
-        temperature_history = []
-        fitness_history = []
+        # Preallocated typed buffers (one slot per iteration) avoid boxing every
+        # float and regrowing lists; they are trimmed to the completed steps.
+        temperature_history = array('d', bytes(8 * self.config.max_iterations))
+        fitness_history = array('d', bytes(8 * self.config.max_iterations))
+        recorded = 0
         accepted_moves = 0
         rejected_moves = 0
         last_improvement_iteration = 0
         no_improvement_count = 0
         
+        # Sliding window of recent accept (1) / reject (0) outcomes
+        recent_moves: Deque[int] = deque(maxlen=ACCEPTANCE_WINDOW)
+        recent_accepted = 0
+        
+        # Bind attributes used on every iteration to locals
+        mutate = self.mutator.mutate
+        get_temp = self.scheduler.get_temperature
+        score_candidates = self._score_candidates
+        should_accept = self._should_accept
+        max_complexity = self.config.max_complexity
+        neighbors_per_iteration = self.config.neighbors_per_iteration
+        moves_per_temperature = max(1, self.config.moves_per_temperature)
+        prune_margin = self.config.prune_margin
+        max_no_improvement = self.config.max_no_improvement
+        final_temperature = self.config.final_temperature
+        timeout = self.config.timeout_seconds
+        _mono = time.monotonic
+        n_pos = len(positive_examples)
+        n_neg = len(negative_examples)
+        
+        # An initial pattern that already satisfies early_stop needs no search;
+        # the run then reports zero iterations
+        stop_reached = early_stop is not None and early_stop(best_fitness)
+        convergence_reason = "early_stop" if stop_reached else "max_iterations"
+        iteration = -1
+        
         # Main optimization loop
-        for iteration in range(self.config.max_iterations):
+        for iteration in range(0 if stop_reached else self.config.max_iterations):
             # Check timeout
-            if self.config.timeout_seconds and (time.time() - start_time) > self.config.timeout_seconds:
+            if timeout and (_mono() - start_time) > timeout:
                 convergence_reason = "timeout"
                 break
             
-            # Get current temperature
-            temperature = self.scheduler.get_temperature(iteration, last_improvement_iteration)
-            temperature_history.append(temperature)
+            # Get the temperature for the next block of moves; the chain runs
+            # moves_per_temperature steps at each level before cooling
+            if iteration % moves_per_temperature == 0:
+                acceptance_rate = recent_accepted / len(recent_moves) if recent_moves else None
+                temperature = get_temp(iteration, last_improvement_iteration, acceptance_rate)
+            temperature_history[iteration] = temperature
+            recorded = iteration + 1
             
-            # Generate neighbor solution
-            neighbor_pattern = self.mutator.mutate(current_pattern)
-            
-            # Ensure pattern is within complexity limits
-            if neighbor_pattern.complexity() > self.config.max_complexity:
+            # Generate neighbor candidates within complexity limits
+            candidates = [mutate(current_pattern) for _ in range(neighbors_per_iteration)]
+            candidates = [c for c in candidates if c.complexity() <= max_complexity]
+            if not candidates:
                 rejected_moves += 1
-                fitness_history.append(current_fitness.total_score)
+                fitness_history[iteration] = current_fitness.total_score
+                if len(recent_moves) == ACCEPTANCE_WINDOW:
+                    recent_accepted -= recent_moves[0]
+                recent_moves.append(0)
                 continue
             
-            # Evaluate neighbor
-            neighbor_fitness = fitness_scorer.score(neighbor_pattern, positive_examples, negative_examples)
+            # Evaluate candidates and keep the best one as the proposed neighbor.
+            # Neighbors scoring more than prune_margin * T below the current one
+            # are accepted with probability < exp(-prune_margin), so their
+            # scoring may stop early.
+            min_required = None
+            if prune_margin is not None:
+                min_required = current_fitness.total_score - prune_margin * temperature
+            candidate_fitness = score_candidates(
+                candidates, positive_examples, negative_examples, fitness_scorer, fitness_cache,
+                min_required
+            )
+            best_index = max(
+                range(len(candidates)),
+                key=lambda i: (not candidate_fitness[i].pruned, candidate_fitness[i].total_score)
+            )
+            neighbor_pattern = candidates[best_index]
+            neighbor_fitness = candidate_fitness[best_index]
             
-            # Decide whether to accept the neighbor
-            accept = self._should_accept(
-                current_fitness.total_score,
-                neighbor_fitness.total_score,
-                temperature
+            # Decide whether to accept the neighbor; improving moves are taken
+            # inline, only downhill moves need the Metropolis draw
+            accept = not neighbor_fitness.pruned and (
+                neighbor_fitness.total_score > current_fitness.total_score or
+                should_accept(current_fitness.total_score, neighbor_fitness.total_score, temperature)
             )
             
             if accept:
@@ -189,53 +337,96 @@ class SimulatedAnnealing:
                 
                 # Check if this is the best solution so far
                 if neighbor_fitness.total_score > best_fitness.total_score:
-                    best_pattern = neighbor_pattern.clone()
+                    best_pattern = neighbor_pattern
                     best_fitness = neighbor_fitness
                     last_improvement_iteration = iteration
                     no_improvement_count = 0
+                    stop_reached = early_stop is not None and early_stop(best_fitness)
                 else:
                     no_improvement_count += 1
             else:
                 rejected_moves += 1
                 no_improvement_count += 1
             
-            fitness_history.append(current_fitness.total_score)
+            if len(recent_moves) == ACCEPTANCE_WINDOW:
+                recent_accepted -= recent_moves[0]
+            recent_moves.append(int(accept))
+            recent_accepted += int(accept)
+            
+            fitness_history[iteration] = current_fitness.total_score
             
-            # Check for early convergence
-            if no_improvement_count >= self.config.max_no_improvement:
+            # Convergence checks, cheapest comparison first within each test;
+            # the branch order fixes which reason wins when several hold
+            if no_improvement_count >= max_no_improvement:
                 convergence_reason = "no_improvement"
                 break
-            
-            # Check if we found a perfect solution
-            if (best_fitness.total_score >= 0.999 and 
-                best_fitness.positive_matches == len(positive_examples) and
-                best_fitness.negative_matches == len(negative_examples)):
+            if (best_fitness.positive_matches == n_pos and
+                best_fitness.negative_matches == n_neg and
+                best_fitness.total_score >= 0.999):
                 convergence_reason = "perfect_solution"
                 break
-            
-            # Check for temperature convergence
-            if temperature < self.config.final_temperature:
+            if stop_reached:
+                convergence_reason = "early_stop"
+                break
+            if temperature < final_temperature:
                 convergence_reason = "temperature_converged"
                 break
         
-        else:
-            convergence_reason = "max_iterations"
-        
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         
         return SAResult(
             best_pattern=best_pattern,
             best_fitness=best_fitness,
             iterations=iteration + 1,
             time_seconds=total_time,
-            temperature_history=temperature_history,
-            fitness_history=fitness_history,
+            temperature_history=temperature_history[:recorded],
+            fitness_history=fitness_history[:recorded],
             accepted_moves=accepted_moves,
             rejected_moves=rejected_moves,
             convergence_reason=convergence_reason,
-            final_temperature=temperature_history[-1] if temperature_history else 0.0
+            final_temperature=temperature_history[recorded - 1] if recorded else 0.0
         )
     
+    def _score_candidates(
+        self,
+        candidates: List[PatternAST],
+        positive_examples: List[str],
+        negative_examples: List[str],
+        fitness_scorer: FitnessScorer,
+        fitness_cache: Dict[str, FitnessResult],
+        min_required: Optional[float] = None
+    ) -> List[FitnessResult]:
+        """Score candidate patterns in one batch, reusing memoized results.
+        
+        ``min_required`` is passed on to ``score_batch``; pruned results are
+        returned but never cached.
+        """
+        regexes = [c.to_regex() for c in candidates]
+        
+        # Batch-score each distinct regex that has not been seen yet
+        pending: Dict[str, PatternAST] = {}
+        for regex, candidate in zip(regexes, candidates):
+            if regex not in fitness_cache and regex not in pending:
+                pending[regex] = candidate
+        
+        fresh: Dict[str, FitnessResult] = {}
+        if pending:
+            results = fitness_scorer.score_batch(
+                list(pending.values()), positive_examples, negative_examples, min_required
+            )
+            fresh = dict(zip(pending.keys(), results))
+            
+            if self.config.fitness_cache_size > 0:
+                for regex, fitness in fresh.items():
+                    if fitness.pruned:
+                        continue
+                    if len(fitness_cache) >= self.config.fitness_cache_size:
+                        # FIFO eviction: drop the oldest entry
+                        del fitness_cache[next(iter(fitness_cache))]
+                    fitness_cache[regex] = fitness
+        
+        return [fresh[regex] if regex in fresh else fitness_cache[regex] for regex in regexes]
+    
     def _should_accept(self, current_score: float, neighbor_score: float, temperature: float) -> bool:
         """Decide whether to accept a neighbor solution."""
         if neighbor_score > current_score:
@@ -246,30 +437,56 @@ class SimulatedAnnealing:
             # No randomness at zero temperature
             return False
         
-        # Accept worse solutions with probability based on temperature
+        # Accept worse solutions with probability exp(delta / T). Comparing in
+        # log space (U < exp(delta / T)  <=>  delta > T * log(U)) avoids the exp
+        # call; 1 - random() lies in (0, 1] so the log is always defined.
         delta = neighbor_score - current_score
-        probability = math.exp(delta / temperature)
-        return random.random() < probability
+        return delta > temperature * math.log(1.0 - self._rng.random())
     
     def optimize_with_restarts(
         self,
         positive_examples: List[str],
         negative_examples: List[str],
         fitness_scorer: FitnessScorer,
-        num_restarts: int = 3
+        num_restarts: int = 3,
+        max_workers: Optional[int] = None
     ) -> SAResult:
-        """Run multiple SA optimizations and return the best result."""
-        best_result = None
+        """Run multiple SA optimizations and return the best result.
         
-        for restart in range(num_restarts):
-            # Use different random seeds for each restart if original seed was set
-            if self.config.random_seed is not None:
-                current_seed = self.config.random_seed + restart
-                random.seed(current_seed)
-                # np.random.seed(current_seed)  # Optional
-            
-            result = self.optimize(positive_examples, negative_examples, fitness_scorer)
-            
+        Each restart is a fresh optimizer of this class (so a
+        ``ParallelTemperingSA`` restarts its whole set of replicas). Restarts
+        are independent chains, so they run in a process pool of up to
+        ``max_workers`` processes (default: one per CPU). ``max_workers=1`` runs
+        them serially in the current process. The fitness scorer must be picklable
+        when more than one worker is used.
+        """
+        # Use different random seeds for each restart if original seed was set;
+        # otherwise draw them here so forked workers don't share RNG state
+        if self.config.random_seed is not None:
+            seeds = [self.config.random_seed + restart for restart in range(num_restarts)]
+        else:
+            seeds = [self._rng.randrange(2 ** 32) for _ in range(num_restarts)]
+        
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, num_restarts))
+        
+        run = partial(
+            _run_restart,
+            type(self),
+            self.config,
+            positive_examples=positive_examples,
+            negative_examples=negative_examples,
+            fitness_scorer=fitness_scorer
+        )
+        if max_workers == 1:
+            results = [run(seed) for seed in seeds]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(run, seeds))
+        
+        best_result = None
+        for restart, result in enumerate(results):
             if best_result is None or result.best_fitness.total_score > best_result.best_fitness.total_score:
                 best_result = result
                 # Add restart information
@@ -279,6 +496,19 @@ class SimulatedAnnealing:
     
     def get_optimization_stats(self, result: SAResult) -> Dict[str, Any]:
         """Get detailed statistics from optimization result."""
+        fitness = result.best_fitness
+        total_moves = result.accepted_moves + result.rejected_moves
+        
+        # Guard the rates: an immediate timeout makes no moves, and empty
+        # example lists have zero totals
+        acceptance_rate = result.accepted_moves / total_moves if total_moves else 0.0
+        positive_match_rate = (
+            fitness.positive_matches / fitness.positive_total if fitness.positive_total else 0.0
+        )
+        negative_match_rate = (
+            fitness.negative_matches / fitness.negative_total if fitness.negative_total else 0.0
+        )
+        
         return {
             "final_score": result.best_fitness.total_score,
             "correctness_score": result.best_fitness.correctness_score,
@@ -291,9 +521,9 @@ class SimulatedAnnealing:
             "time_seconds": result.time_seconds,
             "accepted_moves": result.accepted_moves,
             "rejected_moves": result.rejected_moves,
-            "acceptance_rate": result.accepted_moves / (result.accepted_moves + result.rejected_moves),
+            "acceptance_rate": acceptance_rate,
             "convergence_reason": result.convergence_reason,
             "final_temperature": result.final_temperature,
-            "positive_match_rate": result.best_fitness.positive_matches / result.best_fitness.positive_total,
-            "negative_match_rate": result.best_fitness.negative_matches / result.best_fitness.negative_total,
+            "positive_match_rate": positive_match_rate,
+            "negative_match_rate": negative_match_rate,
         }
\ No newline at end of file
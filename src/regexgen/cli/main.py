@@ -1,5 +1,6 @@
 """Main CLI entry point for RegexGenerator."""
 
+import os
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
@@ -14,6 +15,7 @@ from regexgen import __version__
 class Algorithm(str, Enum):
     """Available optimization algorithms."""
     SIMULATED_ANNEALING = "sa"
+    PARALLEL_TEMPERING = "pt"
     GENETIC_ALGORITHM = "ga"
 
 
@@ -69,6 +71,12 @@ console = Console()
     default=30,
     help="Timeout in seconds."
 )
+@click.option(
+    "-j", "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Independent optimization runs to execute in parallel (0 = one per CPU)."
+)
 @click.option(
     "--scoring",
     type=click.Choice([s.value for s in ScoringMode]),
@@ -110,6 +118,7 @@ def cli(
     max_complexity: int,
     max_iterations: int,
     timeout: int,
+    jobs: int,
     scoring: str,
     seed: Optional[int],
     output_json: bool,
@@ -142,9 +151,8 @@ def cli(
     all_positives = list(positive_examples)
     if file:
         try:
-            with open(file, 'r', encoding='utf-8') as f:
-                file_positives = [line.strip() for line in f if line.strip()]
-                all_positives.extend(file_positives)
+            lines = file.read_text(encoding='utf-8').splitlines()
+            all_positives.extend(filter(None, map(str.strip, lines)))
         except Exception as e:
             console.print(f"[red]Error reading file {file}: {e}[/red]")
             raise click.Abort()
@@ -153,13 +161,18 @@ def cli(
     all_negatives = list(negative)
     if negative_file:
         try:
-            with open(negative_file, 'r', encoding='utf-8') as f:
-                file_negatives = [line.strip() for line in f if line.strip()]
-                all_negatives.extend(file_negatives)
+            lines = negative_file.read_text(encoding='utf-8').splitlines()
+            all_negatives.extend(filter(None, map(str.strip, lines)))
         except Exception as e:
             console.print(f"[red]Error reading negative file {negative_file}: {e}[/red]")
             raise click.Abort()
     
+    # Drop duplicate examples (order-preserving); every fitness evaluation
+    # matches each example, so repeats only add work
+    raw_counts = (len(all_positives), len(all_negatives))
+    all_positives = list(dict.fromkeys(all_positives))
+    all_negatives = list(dict.fromkeys(all_negatives))
+    
     # Validate input
     if not all_positives:
         console.print("[red]Error: No positive examples provided.[/red]")
@@ -169,16 +182,22 @@ def cli(
     if verbose:
         console.print(f"[dim]Positive examples: {len(all_positives)}[/dim]")
         console.print(f"[dim]Negative examples: {len(all_negatives)}[/dim]")
+        duplicates = raw_counts[0] - len(all_positives) + raw_counts[1] - len(all_negatives)
+        if duplicates:
+            console.print(f"[dim]Duplicate examples removed: {duplicates}[/dim]")
         console.print(f"[dim]Algorithm: {algorithm}[/dim]")
         console.print(f"[dim]Max complexity: {max_complexity}[/dim]")
         console.print(f"[dim]Max iterations: {max_iterations}[/dim]")
         console.print(f"[dim]Scoring: {scoring}[/dim]")
+        if jobs != 1:
+            console.print(f"[dim]Jobs: {jobs or 'auto'}[/dim]")
         if seed is not None:
             console.print(f"[dim]Seed: {seed}[/dim]")
         console.print()
     
     # Import required components
     from regexgen.algorithms.simulated_annealing import SimulatedAnnealing, SAConfig, CoolingSchedule
+    from regexgen.algorithms.parallel_tempering import ParallelTemperingSA, PTConfig
     from regexgen.scoring.fitness import MultiCriteriaScorer, ScoringMode
     from regexgen.validation.validator import PatternValidator
     
@@ -204,7 +223,7 @@ def cli(
     
     # Configure optimization
     scoring_mode = ScoringMode(scoring)
-    sa_config = SAConfig(
+    config_options = dict(
         max_iterations=max_iterations,
         max_complexity=max_complexity,
         random_seed=seed,
@@ -213,23 +232,39 @@ def cli(
     
     # Create components
     fitness_scorer = MultiCriteriaScorer(mode=scoring_mode, timeout_seconds=1.0)
-    optimizer = SimulatedAnnealing(config=sa_config)
+    if algorithm == Algorithm.PARALLEL_TEMPERING.value:
+        optimizer = ParallelTemperingSA(config=PTConfig(**config_options))
+    else:
+        optimizer = SimulatedAnnealing(config=SAConfig(**config_options))
     validator = PatternValidator(timeout_seconds=2.0)
     
-    if verbose:
-        console.print("[dim]Starting pattern optimization...[/dim]")
-        
-        with console.status("[bold green]Optimizing pattern...") as status:
-            # Run optimization
-            result = optimizer.optimize(all_positives, all_negatives, fitness_scorer)
+    def run_optimizer():
+        if jobs == 1:
+            return optimizer.optimize(all_positives, all_negatives, fitness_scorer)
+        # Each job is an independent restart running in its own process; a
+        # tempering restart runs all of its replicas
+        num_jobs = jobs or os.cpu_count() or 1
+        return optimizer.optimize_with_restarts(
+            all_positives, all_negatives, fitness_scorer,
+            num_restarts=num_jobs, max_workers=num_jobs
+        )
+    
+    # Leaving the block shuts down any worker pools they started
+    with fitness_scorer, validator:
+        if verbose:
+            console.print("[dim]Starting pattern optimization...[/dim]")
             
-            if verbose:
-                status.update("[bold green]Validating result...")
-                validation = validator.validate(result.best_pattern, all_positives, all_negatives)
-    else:
-        # Run optimization without progress indicator
-        result = optimizer.optimize(all_positives, all_negatives, fitness_scorer)
-        validation = validator.validate(result.best_pattern, all_positives, all_negatives)
+            with console.status("[bold green]Optimizing pattern...") as status:
+                # Run optimization
+                result = run_optimizer()
+                
+                if verbose:
+                    status.update("[bold green]Validating result...")
+                    validation = validator.validate(result.best_pattern, all_positives, all_negatives)
+        else:
+            # Run optimization without progress indicator
+            result = run_optimizer()
+            validation = validator.validate(result.best_pattern, all_positives, all_negatives)
     
     # Generate output
     generated_pattern = result.best_pattern.to_regex()
@@ -2,8 +2,9 @@
 
 import re
 import string
-from typing import List, Set, Dict, Optional, Tuple
+from typing import Final, FrozenSet, Iterator, List, Set, Dict, Optional, Tuple
 from collections import Counter, defaultdict
+from itertools import islice
 from dataclasses import dataclass
 
 from regexgen.patterns.ast import (
@@ -12,6 +13,65 @@ from regexgen.patterns.ast import (
 )
 
 
+_DIGIT_SET: Final[FrozenSet[str]] = frozenset(string.digits)
+_LOWER_SET: Final[FrozenSet[str]] = frozenset(string.ascii_lowercase)
+_UPPER_SET: Final[FrozenSet[str]] = frozenset(string.ascii_uppercase)
+_ALPHA_SET: Final[FrozenSet[str]] = _LOWER_SET | _UPPER_SET
+
+IDENTIFIER_CHARS = _ALPHA_SET | _DIGIT_SET | frozenset('-_.')
+
+# Character types reported by structure analysis, indexed by category number
+_CHAR_TYPE_NAMES: Final = ('digit', 'lower', 'upper', 'alpha', 'punct', 'space', 'other')
+
+
+def _char_category(char: str) -> int:
+    """Classify a single character, as an index into _CHAR_TYPE_NAMES."""
+    if char.isdigit():
+        return 0
+    elif char.islower():
+        return 1
+    elif char.isupper():
+        return 2
+    elif char.isalpha():
+        return 3
+    elif char in string.punctuation:
+        return 4
+    elif char.isspace():
+        return 5
+    else:
+        return 6
+
+
+# Precomputed categories of all ASCII code points
+_ASCII_CATEGORIES: Final = bytes(_char_category(chr(code)) for code in range(128))
+
+# Shared character-class nodes for structure-based seeds; nodes are immutable,
+# so every generated pattern can reuse them
+_CHAR_TYPE_NODES: Final[Dict[str, PatternNode]] = {
+    'digit': CharacterClassNode(characters=_DIGIT_SET),
+    'lower': CharacterClassNode(characters=_LOWER_SET),
+    'upper': CharacterClassNode(characters=_UPPER_SET),
+    'alpha': CharacterClassNode(characters=_ALPHA_SET),
+}
+_WILDCARD: Final = WildcardNode()
+
+# Seed regexes for each recognized pattern type
+_DOMAIN_TEMPLATES: Final[Dict[str, str]] = {
+    'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+    'url': r'https?://[a-zA-Z0-9.-]+(?:\.[a-zA-Z]{2,})?(?:/.*)?',
+    'phone': r'\+?[\d\s\-\(\)]+',
+    'date_iso': r'\d{4}-\d{2}-\d{2}',
+    'date_us': r'\d{1,2}/\d{1,2}/\d{4}',
+    'time': r'\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp][Mm])?',
+    'ipv4': r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}',
+    'hex_color': r'#[0-9a-fA-F]{6}',
+    'uuid': r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}',
+    'digits': r'\d+',
+    'letters': r'[a-zA-Z]+',
+    'alphanumeric': r'[a-zA-Z0-9]+',
+}
+
+
 @dataclass
 class PatternAnalysis:
     """Analysis results for a set of example strings."""
@@ -40,6 +100,17 @@ class PatternAnalyzer:
             'hex_color': re.compile(r'^#[0-9a-fA-F]{6}$'),
             'uuid': re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'),
         }
+        # Bound fullmatch methods, checked in order by _detect_pattern_type
+        self._domain_matchers = tuple(
+            (pattern_type, regex.fullmatch) for pattern_type, regex in self.domain_patterns.items()
+        )
+        # All domain patterns as one alternation of named groups (anchors
+        # dropped); a fullmatch reports the first type an example matches
+        self._domain_union = re.compile("|".join(
+            f"(?P<{pattern_type}>{regex.pattern[1:-1]})"
+            for pattern_type, regex in self.domain_patterns.items()
+        ))
+        self._domain_order = {pattern_type: i for i, pattern_type in enumerate(self.domain_patterns)}
     
     def analyze_examples(self, examples: List[str]) -> PatternAnalysis:
         """Analyze a list of example strings to understand their structure."""
@@ -60,23 +131,27 @@ class PatternAnalyzer:
         length_range = (min(lengths), max(lengths))
         common_length = lengths[0] if all(l == lengths[0] for l in lengths) else None
         
-        # Character analysis by position
+        # Character sets and character-type counts by position, in one pass
         character_sets = defaultdict(set)
-        max_len = max(lengths)
+        type_counts: Dict[int, Dict[int, int]] = defaultdict(dict)
         
         for example in examples:
             for i, char in enumerate(example):
                 character_sets[i].add(char)
+                code = ord(char)
+                category = _ASCII_CATEGORIES[code] if code < 128 else _char_category(char)
+                counts = type_counts[i]
+                counts[category] = counts.get(category, 0) + 1
         
         # Detect common prefixes and suffixes
-        common_prefixes = self._find_common_prefixes(examples)
-        common_suffixes = self._find_common_suffixes(examples)
+        common_prefixes = self._find_common_prefixes(examples, character_sets, length_range[0])
+        common_suffixes = self._find_common_suffixes(examples, length_range[0])
         
         # Detect pattern type
         pattern_type = self._detect_pattern_type(examples)
         
         # Analyze structure (sequence of character types)
-        detected_structure = self._analyze_structure(examples)
+        detected_structure = self._analyze_structure(lengths, type_counts)
         
         # Find repetitive segments
         repetitive_segments = self._find_repetitive_segments(examples)
@@ -94,125 +169,176 @@ class PatternAnalyzer:
     
     def _detect_pattern_type(self, examples: List[str]) -> str:
         """Detect the type of pattern from examples."""
-        # Test against known domain patterns
-        for pattern_type, regex in self.domain_patterns.items():
-            if all(regex.match(ex) for ex in examples):
+        # One pass with the combined domain regex finds, for each example, the
+        # first type it matches. No type before the latest of those can match
+        # every example, so only the remaining types need individual checks.
+        first_index = 0
+        union_fullmatch = self._domain_union.fullmatch
+        for ex in examples:
+            match = union_fullmatch(ex)
+            if match is None:
+                first_index = len(self._domain_matchers)
+                break
+            first_index = max(first_index, self._domain_order[match.lastgroup])
+        
+        # Test the remaining domain patterns, stopping at the first miss
+        for pattern_type, fullmatch in self._domain_matchers[first_index:]:
+            for ex in examples:
+                if not fullmatch(ex):
+                    break
+            else:
                 return pattern_type
         
-        # Analyze character composition
-        all_chars = ''.join(examples)
+        # Analyze character composition in one pass over the examples, using
+        # the whole-string str predicates; empty examples add no characters
+        is_digits = is_letters = is_alnum = is_identifier = True
+        for ex in examples:
+            if not ex:
+                continue
+            is_digits = is_digits and ex.isdigit()
+            is_letters = is_letters and ex.isalpha()
+            is_alnum = is_alnum and ex.isalnum()
+            is_identifier = is_identifier and IDENTIFIER_CHARS.issuperset(ex)
+            if not (is_digits or is_letters or is_alnum or is_identifier):
+                break
         
-        if all(c.isdigit() for c in all_chars):
+        if is_digits:
             return 'digits'
-        elif all(c.isalpha() for c in all_chars):
+        elif is_letters:
             return 'letters'
-        elif all(c.isalnum() for c in all_chars):
+        elif is_alnum:
             return 'alphanumeric'
-        elif all(c in string.ascii_letters + string.digits + '-_.' for c in all_chars):
+        elif is_identifier:
             return 'identifier'
         else:
             return 'mixed'
     
-    def _analyze_structure(self, examples: List[str]) -> List[str]:
-        """Analyze the character type structure across examples."""
-        if not examples:
+    def _analyze_structure(self, lengths: List[int], type_counts: Dict[int, Dict[int, int]]) -> List[str]:
+        """Analyze the character type structure from per-position type counts."""
+        if not lengths:
             return []
         
         # Find the most common length or use the maximum
-        lengths = [len(ex) for ex in examples]
-        target_length = max(set(lengths), key=lengths.count)
+        length_counts = Counter(lengths)
+        target_length = max(set(lengths), key=length_counts.__getitem__)
         
+        # Most common type at each position (positions are contiguous from 0);
+        # ties go to the type seen first, as the counts keep insertion order
         structure = []
-        
         for pos in range(target_length):
-            char_types = []
-            for example in examples:
-                if pos < len(example):
-                    char = example[pos]
-                    if char.isdigit():
-                        char_types.append('digit')
-                    elif char.islower():
-                        char_types.append('lower')
-                    elif char.isupper():
-                        char_types.append('upper')
-                    elif char.isalpha():
-                        char_types.append('alpha')
-                    elif char in string.punctuation:
-                        char_types.append('punct')
-                    elif char.isspace():
-                        char_types.append('space')
-                    else:
-                        char_types.append('other')
-            
-            # Find most common type at this position
-            if char_types:
-                most_common = Counter(char_types).most_common(1)[0][0]
-                structure.append(most_common)
+            if pos not in type_counts:
+                break
+            counts = type_counts[pos]
+            structure.append(_CHAR_TYPE_NAMES[max(counts, key=counts.__getitem__)])
         
         return structure
     
-    def _find_common_prefixes(self, examples: List[str]) -> List[str]:
-        """Find common prefixes in examples."""
+    @staticmethod
+    def _longest_common_prefix(examples: List[str]) -> str:
+        """Longest prefix shared by all examples.
+        
+        Any prefix shared by the lexicographically smallest and largest examples
+        is shared by every example in between, so only those two are compared
+        character by character; finding them is a C-level min/max.
+        """
+        if not examples:
+            return ''
+        
+        first = min(examples)
+        last = max(examples)
+        for i, char in enumerate(first):
+            if char != last[i]:
+                return first[:i]
+        return first
+    
+    def _find_common_prefixes(
+        self,
+        examples: List[str],
+        character_sets: Optional[Dict[int, Set[str]]] = None,
+        min_length: Optional[int] = None
+    ) -> List[str]:
+        """Find common prefixes in examples.
+        
+        With the per-position ``character_sets`` from ``analyze_examples``, the
+        prefix ends at the first position holding more than one character (or
+        past the shortest example, ``min_length``), so the examples are not
+        scanned again.
+        """
         if not examples:
             return []
         
-        prefixes = []
-        min_len = min(len(ex) for ex in examples)
-        
-        for i in range(1, min_len + 1):
-            prefix = examples[0][:i]
-            if all(ex.startswith(prefix) for ex in examples):
-                prefixes.append(prefix)
-            else:
-                break
-        
-        return prefixes
+        if character_sets is None:
+            lcp = self._longest_common_prefix(examples)
+        else:
+            if min_length is None:
+                min_length = min(len(ex) for ex in examples)
+            length = 0
+            while length < min_length and len(character_sets[length]) == 1:
+                length += 1
+            lcp = examples[0][:length]
+        return [lcp[:i] for i in range(1, len(lcp) + 1)]
     
-    def _find_common_suffixes(self, examples: List[str]) -> List[str]:
-        """Find common suffixes in examples."""
+    def _find_common_suffixes(self, examples: List[str], min_length: Optional[int] = None) -> List[str]:
+        """Find common suffixes in examples.
+        
+        Compares characters in place from the end of each example and stops at
+        the first mismatch, without building reversed copies.
+        """
         if not examples:
             return []
         
-        suffixes = []
-        min_len = min(len(ex) for ex in examples)
-        
-        for i in range(1, min_len + 1):
-            suffix = examples[0][-i:]
-            if all(ex.endswith(suffix) for ex in examples):
-                suffixes.append(suffix)
-            else:
+        if min_length is None:
+            min_length = min(len(ex) for ex in examples)
+        first = examples[0]
+        length = 0
+        while length < min_length:
+            index = -1 - length
+            char = first[index]
+            if not all(ex[index] == char for ex in examples):
                 break
+            length += 1
         
-        return suffixes
+        lcs = first[len(first) - length:]
+        return [lcs[-i:] for i in range(1, length + 1)]
     
     def _find_repetitive_segments(self, examples: List[str]) -> List[Tuple[str, int, int]]:
         """Find repetitive segments in examples."""
         segments = []
         
-        if not examples:
-            return segments
-        
         # Look for repeated character patterns
         for example in examples[:3]:  # Check first few examples
-            for start in range(len(example)):
-                for length in range(2, min(6, len(example) - start + 1)):
-                    segment = example[start:start + length]
-                    
-                    # Check if this segment appears multiple times
-                    count = 0
-                    pos = start
-                    while pos + length <= len(example):
-                        if example[pos:pos + length] == segment:
-                            count += 1
-                            pos += length
-                        else:
-                            break
-                    
-                    if count > 1:
-                        segments.append((segment, start, start + length * count))
+            segments.extend(self._tandem_repeats(example))
         
         return segments
     
+    @staticmethod
+    def _tandem_repeats(example: str, max_period: int = 5) -> List[Tuple[str, int, int]]:
+        """Find segments of length 2..max_period repeated back to back.
+        
+        For each start and period, reports the segment and the span covered by
+        its consecutive copies when there are at least two. ``run[j]`` counts how
+        many positions from ``j`` on satisfy ``example[k] == example[k + p]``, so
+        a segment starting at ``i`` repeats ``1 + run[i] // p`` times; all runs
+        come from one backward scan per period, without slicing.
+        """
+        n = len(example)
+        runs = {}
+        for period in range(2, min(max_period, n) + 1):
+            run = [0] * (n + 1)
+            for j in range(n - period - 1, -1, -1):
+                if example[j] == example[j + period]:
+                    run[j] = run[j + 1] + 1
+            runs[period] = run
+        
+        repeats = []
+        for start in range(n):
+            for period in range(2, min(max_period, n - start) + 1):
+                count = 1 + runs[period][start] // period
+                if count > 1:
+                    repeats.append((example[start:start + period], start, start + period * count))
+        
+        return repeats
+    
     def generate_initial_pattern(self, analysis: PatternAnalysis) -> PatternAST:
         """Generate an initial pattern based on analysis."""
         if analysis.pattern_type in self.domain_patterns:
@@ -222,22 +348,7 @@ class PatternAnalyzer:
     
     def _generate_domain_pattern(self, pattern_type: str) -> PatternAST:
         """Generate domain-specific patterns."""
-        domain_templates = {
-            'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-            'url': r'https?://[a-zA-Z0-9.-]+(?:\.[a-zA-Z]{2,})?(?:/.*)?',
-            'phone': r'\+?[\d\s\-\(\)]+',
-            'date_iso': r'\d{4}-\d{2}-\d{2}',
-            'date_us': r'\d{1,2}/\d{1,2}/\d{4}',
-            'time': r'\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp][Mm])?',
-            'ipv4': r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}',
-            'hex_color': r'#[0-9a-fA-F]{6}',
-            'uuid': r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}',
-            'digits': r'\d+',
-            'letters': r'[a-zA-Z]+',
-            'alphanumeric': r'[a-zA-Z0-9]+',
-        }
-        
-        template = domain_templates.get(pattern_type, r'.*')
+        template = _DOMAIN_TEMPLATES.get(pattern_type, r'.*')
         return PatternAST.from_string(template)
     
     def _generate_structure_based_pattern(self, analysis: PatternAnalysis) -> PatternAST:
@@ -250,18 +361,7 @@ class PatternAnalyzer:
         
         # If all same type, create simple character class with quantifier
         if len(set(structure)) == 1:
-            char_type = structure[0]
-            
-            if char_type == 'digit':
-                char_class = CharacterClassNode(characters=set('0123456789'))
-            elif char_type == 'lower':
-                char_class = CharacterClassNode(characters=set(string.ascii_lowercase))
-            elif char_type == 'upper':
-                char_class = CharacterClassNode(characters=set(string.ascii_uppercase))
-            elif char_type == 'alpha':
-                char_class = CharacterClassNode(characters=set(string.ascii_letters))
-            else:
-                char_class = WildcardNode()
+            char_class = _CHAR_TYPE_NODES.get(structure[0], _WILDCARD)
             
             # Add quantifier if there's a clear pattern
             if analysis.common_length:
@@ -275,20 +375,9 @@ class PatternAnalyzer:
                 return PatternAST(quantifier)
         
         # For mixed patterns, start with the most common character type
-        from collections import Counter
         type_counts = Counter(structure)
         most_common_type = type_counts.most_common(1)[0][0]
-        
-        if most_common_type == 'digit':
-            base_class = CharacterClassNode(characters=set('0123456789'))
-        elif most_common_type == 'lower':
-            base_class = CharacterClassNode(characters=set(string.ascii_lowercase))
-        elif most_common_type == 'upper':
-            base_class = CharacterClassNode(characters=set(string.ascii_uppercase))
-        elif most_common_type == 'alpha':
-            base_class = CharacterClassNode(characters=set(string.ascii_letters))
-        else:
-            base_class = WildcardNode()
+        base_class = _CHAR_TYPE_NODES.get(most_common_type, _WILDCARD)
         
         # Add appropriate quantifier
         if analysis.common_length:
@@ -301,24 +390,26 @@ class PatternAnalyzer:
             quantifier = QuantifierNode(base_class, 1, None)  # One or more
             return PatternAST(quantifier)
     
-    def suggest_improvements(self, current_pattern: PatternAST, analysis: PatternAnalysis) -> List[PatternAST]:
-        """Suggest improvements to a current pattern based on analysis."""
-        suggestions = []
+    def iter_suggestions(self, current_pattern: PatternAST, analysis: PatternAnalysis) -> Iterator[PatternAST]:
+        """Lazily yield improvements to a current pattern, best first.
         
+        Each suggestion is built only when requested, so callers that stop after
+        the first one skip the rest.
+        """
         # If pattern doesn't match the detected type, suggest domain-specific pattern
         if analysis.pattern_type in self.domain_patterns:
-            domain_pattern = self._generate_domain_pattern(analysis.pattern_type)
-            suggestions.append(domain_pattern)
+            yield self._generate_domain_pattern(analysis.pattern_type)
         
         # Suggest quantified versions if there's length variation
         if analysis.length_range[0] != analysis.length_range[1]:
             min_len, max_len = analysis.length_range
             if min_len > 0:
-                quantified = PatternAST(QuantifierNode(
+                yield PatternAST(QuantifierNode(
                     child=current_pattern.root.clone(),
                     min_count=min_len,
                     max_count=max_len
                 ))
-                suggestions.append(quantified)
-        
-        return suggestions[:3]  # Return top 3 suggestions
\ No newline at end of file
+    
+    def suggest_improvements(self, current_pattern: PatternAST, analysis: PatternAnalysis) -> List[PatternAST]:
+        """Suggest improvements to a current pattern based on analysis."""
+        return list(islice(self.iter_suggestions(current_pattern, analysis), 3))  # Return top 3 suggestions
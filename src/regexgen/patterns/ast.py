@@ -1,9 +1,10 @@
 """Abstract Syntax Tree representation for regex patterns."""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from functools import lru_cache
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Set, Union, Optional
+from typing import FrozenSet, Iterable, List, Set, Tuple, Union, Optional
 import re
 
 
@@ -18,91 +19,287 @@ class PatternType(Enum):
     WILDCARD = "wildcard"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PatternNode(ABC):
-    """Base class for all pattern AST nodes."""
+    """Base class for all pattern AST nodes.
+    
+    Nodes are frozen: transformations build new nodes instead of editing them,
+    so subtrees may be shared between patterns.
+    """
+    
+    # Memoized results; nodes are immutable, so each is computed at most once
+    _regex: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _complexity: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _depth: Optional[int] = field(default=None, init=False, repr=False, compare=False)
     
-    @abstractmethod
     def to_regex(self) -> str:
         """Convert this node to a regex string."""
-        pass
+        regex = self._regex
+        if regex is None:
+            # Fill uncached descendants bottom-up so no call recurses deeply
+            for node in self._uncached_postorder('_regex'):
+                if node._regex is None:
+                    object.__setattr__(node, '_regex', node._build_regex())
+            regex = self._regex
+        return regex
     
-    @abstractmethod
     def complexity(self) -> int:
         """Calculate the complexity score of this node."""
+        complexity = self._complexity
+        if complexity is None:
+            for node in self._uncached_postorder('_complexity'):
+                if node._complexity is None:
+                    object.__setattr__(node, '_complexity', node._compute_complexity())
+            complexity = self._complexity
+        return complexity
+    
+    def nesting_depth(self) -> int:
+        """Maximum number of nested groups and quantifiers in this subtree."""
+        depth = self._depth
+        if depth is None:
+            for node in self._uncached_postorder('_depth'):
+                if node._depth is None:
+                    object.__setattr__(node, '_depth', node._compute_nesting_depth())
+            depth = self._depth
+        return depth
+    
+    def summary(self) -> Tuple[str, int, int]:
+        """Regex, complexity and nesting depth of this subtree.
+        
+        Fills all three caches in a single walk instead of one per value.
+        """
+        if self._regex is None or self._complexity is None or self._depth is None:
+            order = []
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if node._regex is None or node._complexity is None or node._depth is None:
+                    order.append(node)
+                    stack.extend(node.children())
+            
+            for node in reversed(order):
+                if node._regex is None:
+                    object.__setattr__(node, '_regex', node._build_regex())
+                if node._complexity is None:
+                    object.__setattr__(node, '_complexity', node._compute_complexity())
+                if node._depth is None:
+                    object.__setattr__(node, '_depth', node._compute_nesting_depth())
+        return self._regex, self._complexity, self._depth
+    
+    def children(self) -> Tuple['PatternNode', ...]:
+        """Direct child nodes, in pattern order."""
+        return ()
+    
+    def first_chars(self) -> Optional[FrozenSet[str]]:
+        """Characters a match of this node can start with; None means any."""
+        return frozenset()
+    
+    def is_well_formed(self) -> bool:
+        """Whether this node, given its direct children, renders a legal regex."""
+        return True
+    
+    def _uncached_postorder(self, attr: str) -> List['PatternNode']:
+        """Nodes of this subtree missing ``attr``, children before parents.
+        
+        Walks with an explicit stack and stops at cached subtrees, whose
+        descendants are cached as well.
+        """
+        order = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if getattr(node, attr) is None:
+                order.append(node)
+                stack.extend(node.children())
+        order.reverse()
+        return order
+    
+    @abstractmethod
+    def _build_regex(self) -> str:
+        """Build the regex string for this node (uncached)."""
         pass
     
     @abstractmethod
-    def clone(self) -> 'PatternNode':
-        """Create a deep copy of this node."""
+    def _compute_complexity(self) -> int:
+        """Compute the complexity score of this node (uncached)."""
         pass
+    
+    def _compute_nesting_depth(self) -> int:
+        """Compute the nesting depth of this node (uncached); leaves have none."""
+        return 0
+    
+    def clone(self) -> 'PatternNode':
+        """Create a deep copy of this node.
+        
+        Nodes and all their fields are immutable, so a node can stand in for its
+        own copy; this keeps the memoized values and costs no traversal.
+        """
+        return self
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LiteralNode(PatternNode):
     """Represents a literal string in the pattern."""
     value: str
     
-    def to_regex(self) -> str:
+    def first_chars(self) -> Optional[FrozenSet[str]]:
+        return frozenset(self.value[:1])
+    
+    def _build_regex(self) -> str:
         return re.escape(self.value)
     
-    def complexity(self) -> int:
+    def _compute_complexity(self) -> int:
         return len(self.value)
-    
-    def clone(self) -> 'LiteralNode':
-        return LiteralNode(self.value)
 
 
-@dataclass
+@lru_cache(maxsize=8192)
+def _compile_or_error(regex_str: str) -> Union[re.Pattern, re.error]:
+    """Compile a regex string, returning the error instead of raising it."""
+    try:
+        return re.compile(regex_str)
+    except re.error as e:
+        return e
+
+
+def compile_regex(regex_str: str) -> re.Pattern:
+    """Compile a regex string through the cache shared by scoring and validation.
+    
+    Mutation keeps producing the same regex strings during a search; this cache
+    is larger than the ``re`` module's internal one, which is also shared with
+    every other user of ``re``. Malformed patterns are memoized too and
+    re-raise their ``re.error`` without being parsed again.
+    """
+    compiled = _compile_or_error(regex_str)
+    if isinstance(compiled, re.error):
+        # Drop the previous raise's frames so the cached error doesn't grow
+        raise compiled.with_traceback(None)
+    return compiled
+
+# Widest code-point span packed into a bitmap by CharacterClassNode.code_runs
+_BITMAP_SPAN = 4096
+
+# Bit shared by every character above Latin-1 in first-character masks
+_MASK_OTHER_BIT = 256
+
+
+def char_mask(chars: Iterable[str]) -> int:
+    """Bitmask of characters: one bit per Latin-1 code point, one for all others."""
+    mask = 0
+    for char in chars:
+        mask |= 1 << min(ord(char), _MASK_OTHER_BIT)
+    return mask
+
+
+def _sorted_code_runs(codes: List[int]) -> List[Tuple[int, int]]:
+    """Runs of consecutive code points, found by sorting."""
+    runs = []
+    for code in sorted(codes):
+        if runs and code == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], code)
+        else:
+            runs.append((code, code))
+    return runs
+
+
+def _escape_class_char(char: str) -> str:
+    """Escape a character that is special inside a character class."""
+    return "\\" + char if char in "\\^-[]" else char
+
+
+@dataclass(frozen=True, slots=True)
 class CharacterClassNode(PatternNode):
-    """Represents a character class like [abc] or [a-z]."""
-    characters: Set[str]
+    """Represents a character class like [abc] or [a-z].
+    
+    Characters and ranges are stored as a frozenset and a tuple, so equal
+    classes compare and hash equal regardless of how they were built.
+    """
+    characters: FrozenSet[str]
     negated: bool = False
-    ranges: List[tuple[str, str]] = None
+    ranges: Tuple[Tuple[str, str], ...] = ()
     
     def __post_init__(self):
-        if self.ranges is None:
-            self.ranges = []
+        # Canonicalize whatever iterables were passed in
+        if not isinstance(self.characters, frozenset):
+            object.__setattr__(self, 'characters', frozenset(self.characters))
+        if not isinstance(self.ranges, tuple):
+            object.__setattr__(self, 'ranges', tuple(self.ranges or ()))
     
-    def to_regex(self) -> str:
+    def _build_regex(self) -> str:
         if not self.characters and not self.ranges:
             return ""
         
-        bracket_content = ""
+        # Collect the bracket contents and join them once
+        parts = ["[^" if self.negated else "["]
         
-        # Add individual characters
-        if self.characters:
-            # Sort for consistency and escape special characters
-            chars = sorted(self.characters)
-            escaped_chars = []
-            for char in chars:
-                if char in "\\^-]":
-                    escaped_chars.append("\\" + char)
-                else:
-                    escaped_chars.append(char)
-            bracket_content += "".join(escaped_chars)
+        # Add individual characters, sorted for consistency; runs of three or
+        # more consecutive code points are written as ranges (e.g. a-z)
+        for start, end in self.code_runs():
+            if end - start >= 2:
+                parts.append(f"{_escape_class_char(chr(start))}-{_escape_class_char(chr(end))}")
+            else:
+                parts.extend(_escape_class_char(chr(code)) for code in range(start, end + 1))
         
         # Add ranges
-        for start, end in self.ranges:
-            bracket_content += f"{start}-{end}"
-        
-        # Handle negation
-        prefix = "^" if self.negated else ""
+        parts.extend(f"{start}-{end}" for start, end in self.ranges)
+        parts.append("]")
         
-        return f"[{prefix}{bracket_content}]"
+        return "".join(parts)
     
-    def complexity(self) -> int:
+    def _compute_complexity(self) -> int:
         return 2 + len(self.characters) + len(self.ranges)  # Base cost for brackets
     
-    def clone(self) -> 'CharacterClassNode':
-        return CharacterClassNode(
-            characters=self.characters.copy(),
-            negated=self.negated,
-            ranges=self.ranges.copy()
-        )
+    def is_well_formed(self) -> bool:
+        return all(start <= end for start, end in self.ranges)
+    
+    def first_chars(self) -> Optional[FrozenSet[str]]:
+        if self.negated:
+            return None
+        if not self.ranges:
+            return self.characters
+        chars = set(self.characters)
+        for start, end in self.ranges:
+            if len(start) != 1 or len(end) != 1:
+                raise ValueError(f"Range {start!r}-{end!r} is not between single characters")
+            if ord(end) - ord(start) > _BITMAP_SPAN:
+                return None
+            chars.update(map(chr, range(ord(start), ord(end) + 1)))
+        return frozenset(chars)
+    
+    def code_runs(self) -> List[Tuple[int, int]]:
+        """Runs of consecutive code points in ``characters``, as ascending (start, end) pairs.
+        
+        The characters are packed into an integer bitmap offset by the lowest code
+        point, and each run is read off with bit operations instead of sorting
+        and comparing characters. Classes spanning more than ``_BITMAP_SPAN``
+        code points fall back to a sorted scan to keep the bitmap small.
+        """
+        if not self.characters:
+            return []
+        
+        codes = list(map(ord, self.characters))
+        low = min(codes)
+        if max(codes) - low > _BITMAP_SPAN:
+            return _sorted_code_runs(codes)
+        
+        bitmap = 0
+        for code in codes:
+            bitmap |= 1 << (code - low)
+        
+        runs = []
+        offset = low
+        while bitmap:
+            # Skip to the lowest set bit, then measure its run of ones
+            zeros = (bitmap & -bitmap).bit_length() - 1
+            bitmap >>= zeros
+            offset += zeros
+            length = (~bitmap & (bitmap + 1)).bit_length() - 1
+            runs.append((offset, offset + length - 1))
+            bitmap >>= length
+            offset += length
+        return runs
 
 
-@dataclass 
+@dataclass(frozen=True, slots=True)
 class QuantifierNode(PatternNode):
     """Represents quantifiers like *, +, ?, {n,m}."""
     child: PatternNode
@@ -110,14 +307,8 @@ class QuantifierNode(PatternNode):
     max_count: Optional[int]  # None means unlimited
     lazy: bool = False
     
-    def to_regex(self) -> str:
-        child_regex = self.child.to_regex()
-        
-        # Wrap child in non-capturing group if necessary
-        if isinstance(self.child, (AlternationNode, GroupNode)):
-            child_regex = f"(?:{child_regex})"
-        
-        # Generate quantifier suffix
+    def suffix(self) -> str:
+        """Quantifier suffix as rendered, including a lazy ``?``."""
         if self.min_count == 0 and self.max_count == 1:
             suffix = "?"
         elif self.min_count == 0 and self.max_count is None:
@@ -125,19 +316,42 @@ class QuantifierNode(PatternNode):
         elif self.min_count == 1 and self.max_count is None:
             suffix = "+"
         elif self.min_count == self.max_count:
-            suffix = f"{{{self.min_count}}}"
+            return f"{{{self.min_count}}}"
         elif self.max_count is None:
-            suffix = f"{{{self.min_count},}}"
+            return f"{{{self.min_count},}}"
         else:
-            suffix = f"{{{self.min_count},{self.max_count}}}"
+            return f"{{{self.min_count},{self.max_count}}}"
         
         # Add lazy modifier if needed
-        if self.lazy and suffix in ["?", "*", "+"]:
-            suffix += "?"
+        return suffix + "?" if self.lazy else suffix
+    
+    def is_well_formed(self) -> bool:
+        if self.max_count is not None and self.min_count > self.max_count:
+            return False
+        
+        child = self.child
+        if isinstance(child, (AlternationNode, GroupNode)):
+            return True  # Rendered inside (?:...)
+        if isinstance(child, AnchorNode) or not child.to_regex():
+            return False  # Nothing to repeat
+        if isinstance(child, QuantifierNode):
+            # A plain greedy repeat may be followed by a single "?" (lazy) or
+            # "+" (possessive), after which nothing else can repeat it
+            if child.suffix() in ("??", "*?", "+?") or isinstance(child.child, QuantifierNode):
+                return False
+            return self.suffix() in ("?", "+")
+        return True
+    
+    def _build_regex(self) -> str:
+        suffix = self.suffix()
         
-        return child_regex + suffix
+        # Wrap child in non-capturing group if necessary; the pieces are
+        # joined in a single allocation
+        if isinstance(self.child, (AlternationNode, GroupNode)):
+            return f"(?:{self.child.to_regex()}){suffix}"
+        return f"{self.child.to_regex()}{suffix}"
     
-    def complexity(self) -> int:
+    def _compute_complexity(self) -> int:
         base_complexity = self.child.complexity()
         quantifier_complexity = 2  # Base cost for quantifier
         
@@ -147,23 +361,24 @@ class QuantifierNode(PatternNode):
         
         return base_complexity + quantifier_complexity
     
-    def clone(self) -> 'QuantifierNode':
-        return QuantifierNode(
-            child=self.child.clone(),
-            min_count=self.min_count,
-            max_count=self.max_count,
-            lazy=self.lazy
-        )
+    def _compute_nesting_depth(self) -> int:
+        return self.child.nesting_depth() + 1
+    
+    def children(self) -> Tuple[PatternNode, ...]:
+        return (self.child,)
+    
+    def first_chars(self) -> Optional[FrozenSet[str]]:
+        return self.child.first_chars()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GroupNode(PatternNode):
     """Represents grouped patterns like (abc) or (?:abc)."""
     child: PatternNode
     capturing: bool = True
     name: Optional[str] = None
     
-    def to_regex(self) -> str:
+    def _build_regex(self) -> str:
         child_regex = self.child.to_regex()
         
         if not self.capturing:
@@ -173,30 +388,39 @@ class GroupNode(PatternNode):
         else:
             return f"({child_regex})"
     
-    def complexity(self) -> int:
+    def _compute_complexity(self) -> int:
         return self.child.complexity() + 2  # Base cost for grouping
     
-    def clone(self) -> 'GroupNode':
-        return GroupNode(
-            child=self.child.clone(),
-            capturing=self.capturing,
-            name=self.name
-        )
+    def _compute_nesting_depth(self) -> int:
+        return self.child.nesting_depth() + 1
+    
+    def children(self) -> Tuple[PatternNode, ...]:
+        return (self.child,)
+    
+    def is_well_formed(self) -> bool:
+        return not (self.capturing and self.name) or self.name.isidentifier()
+    
+    def first_chars(self) -> Optional[FrozenSet[str]]:
+        return self.child.first_chars()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AlternationNode(PatternNode):
     """Represents alternation patterns like abc|def|ghi."""
-    alternatives: List[PatternNode]
+    alternatives: Tuple[PatternNode, ...]
     
-    def to_regex(self) -> str:
+    def __post_init__(self):
+        if not isinstance(self.alternatives, tuple):
+            object.__setattr__(self, 'alternatives', tuple(self.alternatives))
+    
+    def _build_regex(self) -> str:
         if not self.alternatives:
             return ""
         
         alt_strings = [alt.to_regex() for alt in self.alternatives]
         return "|".join(alt_strings)
     
-    def complexity(self) -> int:
+    def _compute_complexity(self) -> int:
         if not self.alternatives:
             return 0
         
@@ -205,39 +429,46 @@ class AlternationNode(PatternNode):
         
         return base_complexity + alternation_complexity
     
-    def clone(self) -> 'AlternationNode':
-        return AlternationNode(
-            alternatives=[alt.clone() for alt in self.alternatives]
-        )
+    def _compute_nesting_depth(self) -> int:
+        return max((alt.nesting_depth() for alt in self.alternatives), default=0)
+    
+    def children(self) -> Tuple[PatternNode, ...]:
+        return self.alternatives
+    
+    def first_chars(self) -> Optional[FrozenSet[str]]:
+        chars = set()
+        for alt in self.alternatives:
+            alt_chars = alt.first_chars()
+            if alt_chars is None:
+                return None
+            chars |= alt_chars
+        return frozenset(chars)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AnchorNode(PatternNode):
     """Represents anchors like ^, $, \\b, \\B."""
     anchor_type: str  # '^', '$', '\\b', '\\B'
     
-    def to_regex(self) -> str:
+    def _build_regex(self) -> str:
         return self.anchor_type
     
-    def complexity(self) -> int:
+    def _compute_complexity(self) -> int:
         return 1
-    
-    def clone(self) -> 'AnchorNode':
-        return AnchorNode(self.anchor_type)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WildcardNode(PatternNode):
     """Represents the . wildcard."""
     
-    def to_regex(self) -> str:
+    def _build_regex(self) -> str:
         return "."
     
-    def complexity(self) -> int:
+    def _compute_complexity(self) -> int:
         return 1
     
-    def clone(self) -> 'WildcardNode':
-        return WildcardNode()
+    def first_chars(self) -> Optional[FrozenSet[str]]:
+        return None
 
 
 class PatternAST:
@@ -246,83 +477,189 @@ class PatternAST:
     def __init__(self, root: PatternNode):
         self.root = root
     
+    @property
+    def root(self) -> PatternNode:
+        """Root node of the pattern tree."""
+        return self._root
+    
+    @root.setter
+    def root(self, value: PatternNode) -> None:
+        # Replacing the root invalidates the memoized regex and complexity
+        self._root = value
+        self.invalidate_cache()
+    
+    def invalidate_cache(self) -> None:
+        """Drop memoized values; the root setter calls this on every new root.
+        
+        Nodes are frozen, so the tree under a root never changes and there is
+        nothing else to invalidate.
+        """
+        self._regex: Optional[str] = None
+        self._complexity: Optional[int] = None
+        self._depth: Optional[int] = None
+        self._hash: Optional[int] = None
+        self._compiled: Optional[re.Pattern] = None
+        self._valid: Optional[bool] = None
+        self._well_formed: Optional[bool] = None
+        self._first_mask: Optional[int] = None
+    
     def to_regex(self) -> str:
         """Convert the entire AST to a regex string."""
-        return self.root.to_regex()
+        if self._regex is None:
+            self._regex = self._root.to_regex()
+        return self._regex
     
     def complexity(self) -> int:
         """Calculate the total complexity of the pattern."""
-        return self.root.complexity()
+        if self._complexity is None:
+            self._complexity = self._root.complexity()
+        return self._complexity
+    
+    def nesting_depth(self) -> int:
+        """Maximum number of nested groups and quantifiers in the pattern."""
+        if self._depth is None:
+            self._depth = self._root.nesting_depth()
+        return self._depth
+    
+    def summary(self) -> Tuple[str, int, int]:
+        """``(regex, complexity, nesting_depth)`` of the pattern, from one tree walk."""
+        if self._regex is None or self._complexity is None or self._depth is None:
+            self._regex, self._complexity, self._depth = self._root.summary()
+        return self._regex, self._complexity, self._depth
+    
+    def first_mask(self) -> int:
+        """``char_mask`` of the characters a match can start with; -1 means any.
+        
+        Nodes have no concatenation, so a non-empty string the pattern matches
+        always starts with one of these characters.
+        """
+        if self._first_mask is None:
+            first = self._root.first_chars()
+            self._first_mask = -1 if first is None else char_mask(first)
+        return self._first_mask
     
     def clone(self) -> 'PatternAST':
-        """Create a deep copy of this AST."""
+        """Create a new AST over the same (immutable) tree, with empty memoized values."""
         return PatternAST(self.root.clone())
     
+    @property
+    def compiled(self) -> re.Pattern:
+        """The compiled regex, built once per pattern; raises re.error if invalid."""
+        if self._compiled is None:
+            self._compiled = compile_regex(self.to_regex())
+        return self._compiled
+    
     def validate(self) -> bool:
         """Check if the pattern compiles to a valid regex."""
-        try:
-            re.compile(self.to_regex())
-            return True
-        except re.error:
-            return False
+        if self._valid is None:
+            try:
+                self.compiled
+                self._valid = True
+            except re.error:
+                self._valid = False
+        return self._valid
+    
+    def is_structurally_valid(self) -> bool:
+        """Check on the tree alone whether the pattern renders a legal regex.
+        
+        Mirrors the errors ``re.compile`` raises for rendered trees (repeats of
+        nothing or of another repeat, reversed bounds and ranges, bad or
+        duplicate group names) without calling the regex engine.
+        """
+        if self._well_formed is None:
+            self._well_formed = _is_well_formed_tree(self._root)
+        return self._well_formed
     
     @classmethod
     def from_string(cls, pattern: str) -> 'PatternAST':
-        """Create a PatternAST from a regex string (simplified parser)."""
-        if not pattern:
-            return cls(LiteralNode(""))
+        """Create a PatternAST from a regex string (simplified parser).
         
-        # Basic parsing for common patterns
-        try:
-            # Handle simple character classes
-            if pattern.startswith('[') and pattern.endswith(']'):
-                inner = pattern[1:-1]
-                if inner == '0-9' or inner == 'd':
-                    return cls(CharacterClassNode(characters=set('0123456789')))
-                elif inner == 'a-z':
-                    return cls(CharacterClassNode(characters=set('abcdefghijklmnopqrstuvwxyz')))
-                elif inner == 'A-Z':
-                    return cls(CharacterClassNode(characters=set('ABCDEFGHIJKLMNOPQRSTUVWXYZ')))
-                elif inner == 'a-zA-Z':
-                    chars = set('abcdefghijklmnopqrstuvwxyz') | set('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-                    return cls(CharacterClassNode(characters=chars))
-                else:
-                    # Parse individual characters
-                    chars = set(inner.replace('-', ''))  # Simple handling
-                    return cls(CharacterClassNode(characters=chars))
-            
-            # Handle \\d shorthand
-            if pattern == '\\d+':
-                digit_class = CharacterClassNode(characters=set('0123456789'))
-                quantifier = QuantifierNode(child=digit_class, min_count=1, max_count=None)
-                return cls(quantifier)
-            
-            # Handle simple quantifiers
-            if pattern.endswith('+'):
-                base_pattern = pattern[:-1]
-                base_ast = cls.from_string(base_pattern)
-                quantifier = QuantifierNode(child=base_ast.root, min_count=1, max_count=None)
-                return cls(quantifier)
-            
-            if pattern.endswith('*'):
-                base_pattern = pattern[:-1]
-                base_ast = cls.from_string(base_pattern)
-                quantifier = QuantifierNode(child=base_ast.root, min_count=0, max_count=None)
-                return cls(quantifier)
-            
-            # Handle wildcard
-            if pattern == '.':
-                return cls(WildcardNode())
-            
-            # Handle simple literals (escape special characters)
-            return cls(LiteralNode(pattern))
-            
-        except:
-            # If parsing fails, fall back to literal
-            return cls(LiteralNode(pattern))
+        Parsed trees are cached per string. Every call returns a new
+        PatternAST, but calls with the same string share the same frozen
+        nodes; nothing is copied.
+        """
+        return cls(_parse_pattern(pattern))
+    
+    def __eq__(self, other: object) -> bool:
+        # Structural equality, so equivalent candidates dedupe in sets and dicts
+        if not isinstance(other, PatternAST):
+            return NotImplemented
+        return self._root == other._root
+    
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(self._root)
+        return self._hash
     
     def __str__(self) -> str:
         return self.to_regex()
     
     def __repr__(self) -> str:
-        return f"PatternAST({self.root!r})"
\ No newline at end of file
+        return f"PatternAST({self.root!r})"
+
+
+def _is_well_formed_tree(root: PatternNode) -> bool:
+    """Whether every node under ``root`` is well formed and group names are unique."""
+    group_names = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if not node.is_well_formed():
+            return False
+        if isinstance(node, GroupNode) and node.capturing and node.name:
+            if node.name in group_names:
+                return False
+            group_names.add(node.name)
+        stack.extend(node.children())
+    return True
+
+@lru_cache(maxsize=1024)
+def _parse_pattern(pattern: str) -> PatternNode:
+    """Parse a regex string into a node tree for PatternAST.from_string.
+    
+    Results are shared between calls and must not be modified; callers clone.
+    """
+    if not pattern:
+        return LiteralNode("")
+    
+    # Basic parsing for common patterns
+    try:
+        # Handle simple character classes
+        if pattern.startswith('[') and pattern.endswith(']'):
+            inner = pattern[1:-1]
+            if inner == '0-9' or inner == 'd':
+                return CharacterClassNode(characters=set('0123456789'))
+            elif inner == 'a-z':
+                return CharacterClassNode(characters=set('abcdefghijklmnopqrstuvwxyz'))
+            elif inner == 'A-Z':
+                return CharacterClassNode(characters=set('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+            elif inner == 'a-zA-Z':
+                chars = set('abcdefghijklmnopqrstuvwxyz') | set('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+                return CharacterClassNode(characters=chars)
+            else:
+                # Parse individual characters
+                chars = set(inner.replace('-', ''))  # Simple handling
+                return CharacterClassNode(characters=chars)
+        
+        # Handle \\d shorthand
+        if pattern == '\\d+':
+            digit_class = CharacterClassNode(characters=set('0123456789'))
+            return QuantifierNode(child=digit_class, min_count=1, max_count=None)
+        
+        # Handle simple quantifiers
+        if pattern.endswith('+'):
+            return QuantifierNode(child=_parse_pattern(pattern[:-1]), min_count=1, max_count=None)
+        
+        if pattern.endswith('*'):
+            return QuantifierNode(child=_parse_pattern(pattern[:-1]), min_count=0, max_count=None)
+        
+        # Handle wildcard
+        if pattern == '.':
+            return WildcardNode()
+        
+        # Handle simple literals (escape special characters)
+        return LiteralNode(pattern)
+        
+    except:
+        # If parsing fails, fall back to literal
+        return LiteralNode(pattern)
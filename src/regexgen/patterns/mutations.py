@@ -2,8 +2,10 @@
 
 import random
 import string
-from typing import List, Set, Optional, Union
+from typing import Dict, List, Set, Optional, Tuple, Union
 from abc import ABC, abstractmethod
+from dataclasses import replace
+from types import ModuleType
 
 from regexgen.patterns.ast import (
     PatternAST, PatternNode, LiteralNode, CharacterClassNode, 
@@ -11,8 +13,56 @@ from regexgen.patterns.ast import (
 )
 
 
+# Character sets shared by every node the operators create; CharacterClassNode
+# keeps a frozenset as is, so these are never copied
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_DIGITS = frozenset(string.digits)
+_LETTERS = frozenset(string.ascii_letters)
+_PRINTABLE62 = frozenset(string.printable[:62])
+_WILDCARD_CHOICES = (_LOWERCASE, _UPPERCASE, _DIGITS, _LETTERS, _PRINTABLE62)
+
+# Concrete node classes, for per-class operator tables
+_NODE_TYPES = (
+    LiteralNode, CharacterClassNode, QuantifierNode, GroupNode,
+    AlternationNode, WildcardNode, AnchorNode
+)
+
+# Sequences for random.choice, built once instead of sliced or concatenated per call
+_PRINTABLE62_CHARS = string.printable[:62]
+_LETTER_DIGIT_CHARS = string.ascii_letters + string.digits
+
+# Shared nodes for the most common mutation results; nodes are immutable, so
+# one instance can appear in any number of patterns
+_LITERAL_NODES = {char: LiteralNode(char) for char in _PRINTABLE62_CHARS}
+_CHAR_CLASS_NODES = {chars: CharacterClassNode(characters=chars) for chars in _WILDCARD_CHOICES}
+
+
+def _with_children(node: PatternNode, new_children: Dict[int, PatternNode]) -> PatternNode:
+    """Copy of ``node`` with the children at the given slots replaced."""
+    if isinstance(node, AlternationNode):
+        alternatives = list(node.alternatives)
+        for slot, child in new_children.items():
+            alternatives[slot] = child
+        return replace(node, alternatives=tuple(alternatives))
+    return replace(node, child=new_children[0])
+
+
 class MutationOperator(ABC):
-    """Abstract base class for pattern mutation operators."""
+    """Abstract base class for pattern mutation operators.
+    
+    Operators draw from ``rng``: the ``random`` module unless a
+    ``PatternMutator`` hands them its own generator.
+    
+    ``node_types`` lists the node classes ``can_apply`` may accept (None: any),
+    letting ``PatternMutator`` pick candidate operators by class. Operators
+    whose ``can_apply`` also inspects the node's contents set
+    ``content_dependent`` so it is still called for them.
+    """
+    
+    rng: Union[random.Random, ModuleType] = random
+    node_types: Optional[Tuple[type, ...]] = None
+    content_dependent: bool = False
     
     @abstractmethod
     def can_apply(self, node: PatternNode) -> bool:
@@ -34,6 +84,9 @@ class MutationOperator(ABC):
 class LiteralToCharClassMutation(MutationOperator):
     """Convert a literal character to a character class."""
     
+    node_types = (LiteralNode,)
+    content_dependent = True
+    
     def can_apply(self, node: PatternNode) -> bool:
         return isinstance(node, LiteralNode) and len(node.value) == 1 and node.value.isalpha()
     
@@ -44,13 +97,13 @@ class LiteralToCharClassMutation(MutationOperator):
         char = node.value
         if char.islower():
             # Create lowercase character class
-            return CharacterClassNode(characters={'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z'})
+            return _CHAR_CLASS_NODES[_LOWERCASE]
         elif char.isupper():
             # Create uppercase character class
-            return CharacterClassNode(characters={'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z'})
+            return _CHAR_CLASS_NODES[_UPPERCASE]
         elif char.isdigit():
             # Create digit character class
-            return CharacterClassNode(characters={'0', '1', '2', '3', '4', '5', '6', '7', '8', '9'})
+            return _CHAR_CLASS_NODES[_DIGITS]
         else:
             return node
     
@@ -62,6 +115,9 @@ class LiteralToCharClassMutation(MutationOperator):
 class CharClassToRangeMutation(MutationOperator):
     """Convert character class with consecutive characters to ranges."""
     
+    node_types = (CharacterClassNode,)
+    content_dependent = True
+    
     def can_apply(self, node: PatternNode) -> bool:
         return isinstance(node, CharacterClassNode) and len(node.characters) > 3
     
@@ -69,34 +125,21 @@ class CharClassToRangeMutation(MutationOperator):
         if not isinstance(node, CharacterClassNode):
             return node
         
-        chars = sorted(node.characters)
         ranges = []
-        remaining_chars = set(node.characters)
+        remaining_chars = []
         
-        # Find consecutive sequences
-        i = 0
-        while i < len(chars):
-            start_char = chars[i]
-            end_char = start_char
-            
-            # Find end of consecutive sequence
-            j = i + 1
-            while j < len(chars) and ord(chars[j]) == ord(chars[j-1]) + 1:
-                end_char = chars[j]
-                j += 1
-            
-            # If we have 3+ consecutive chars, make it a range
-            if j - i >= 3:
-                ranges.append((start_char, end_char))
-                for k in range(i, j):
-                    remaining_chars.discard(chars[k])
-            
-            i = j if j > i + 1 else i + 1
+        # Turn runs of 3+ consecutive chars into ranges; shorter runs are kept
+        # as characters, so the full set is never copied
+        for start, end in node.code_runs():
+            if end - start >= 2:
+                ranges.append((chr(start), chr(end)))
+            else:
+                remaining_chars.extend(map(chr, range(start, end + 1)))
         
         return CharacterClassNode(
             characters=remaining_chars,
             negated=node.negated,
-            ranges=ranges + node.ranges
+            ranges=(*ranges, *node.ranges)
         )
     
     @property
@@ -107,6 +150,8 @@ class CharClassToRangeMutation(MutationOperator):
 class AddQuantifierMutation(MutationOperator):
     """Add a quantifier to a node."""
     
+    node_types = (LiteralNode, CharacterClassNode, GroupNode, AlternationNode, WildcardNode)
+    
     def can_apply(self, node: PatternNode) -> bool:
         return not isinstance(node, (QuantifierNode, AnchorNode))
     
@@ -119,8 +164,8 @@ class AddQuantifierMutation(MutationOperator):
             (1, 3),      # {1,3}
         ]
         
-        min_count, max_count = random.choice(quantifier_types)
-        return QuantifierNode(child=node.clone(), min_count=min_count, max_count=max_count)
+        min_count, max_count = self.rng.choice(quantifier_types)
+        return QuantifierNode(child=node, min_count=min_count, max_count=max_count)
     
     @property
     def name(self) -> str:
@@ -130,6 +175,8 @@ class AddQuantifierMutation(MutationOperator):
 class ModifyQuantifierMutation(MutationOperator):
     """Modify an existing quantifier."""
     
+    node_types = (QuantifierNode,)
+    
     def can_apply(self, node: PatternNode) -> bool:
         return isinstance(node, QuantifierNode)
     
@@ -137,20 +184,20 @@ class ModifyQuantifierMutation(MutationOperator):
         if not isinstance(node, QuantifierNode):
             return node
         
-        mutation_type = random.choice(['bounds', 'laziness'])
+        mutation_type = self.rng.choice(['bounds', 'laziness'])
         
         if mutation_type == 'bounds':
             # Modify quantifier bounds
-            new_min = max(0, node.min_count + random.choice([-1, 0, 1]))
+            new_min = max(0, node.min_count + self.rng.choice([-1, 0, 1]))
             if node.max_count is None:
-                new_max = None if random.random() < 0.7 else random.randint(new_min + 1, new_min + 5)
+                new_max = None if self.rng.random() < 0.7 else self.rng.randint(new_min + 1, new_min + 5)
             else:
-                new_max = max(new_min, node.max_count + random.choice([-1, 0, 1]))
-                if new_max == new_min and random.random() < 0.3:
+                new_max = max(new_min, node.max_count + self.rng.choice([-1, 0, 1]))
+                if new_max == new_min and self.rng.random() < 0.3:
                     new_max = None
             
             return QuantifierNode(
-                child=node.child.clone(),
+                child=node.child,
                 min_count=new_min,
                 max_count=new_max,
                 lazy=node.lazy
@@ -158,7 +205,7 @@ class ModifyQuantifierMutation(MutationOperator):
         
         else:  # laziness
             return QuantifierNode(
-                child=node.child.clone(),
+                child=node.child,
                 min_count=node.min_count,
                 max_count=node.max_count,
                 lazy=not node.lazy
@@ -178,11 +225,11 @@ class GroupingMutation(MutationOperator):
     def apply(self, node: PatternNode) -> PatternNode:
         if isinstance(node, GroupNode):
             # Remove grouping
-            return node.child.clone()
+            return node.child
         else:
             # Add grouping
-            capturing = random.choice([True, False])
-            return GroupNode(child=node.clone(), capturing=capturing)
+            capturing = self.rng.choice([True, False])
+            return GroupNode(child=node, capturing=capturing)
     
     @property
     def name(self) -> str:
@@ -198,70 +245,103 @@ class AlternationMutation(MutationOperator):
     def apply(self, node: PatternNode) -> PatternNode:
         if isinstance(node, AlternationNode):
             # Modify existing alternation
-            if len(node.alternatives) > 1 and random.random() < 0.3:
+            if len(node.alternatives) > 1 and self.rng.random() < 0.3:
                 # Remove one alternative
-                new_alternatives = node.alternatives.copy()
-                new_alternatives.pop(random.randint(0, len(new_alternatives) - 1))
-                return AlternationNode(alternatives=[alt.clone() for alt in new_alternatives])
+                new_alternatives = list(node.alternatives)
+                new_alternatives.pop(self.rng.randint(0, len(new_alternatives) - 1))
+                return AlternationNode(alternatives=new_alternatives)
             else:
                 # Add new alternative
                 new_alt = self._generate_similar_pattern(node.alternatives[0])
-                new_alternatives = [alt.clone() for alt in node.alternatives] + [new_alt]
+                new_alternatives = [*node.alternatives, new_alt]
                 return AlternationNode(alternatives=new_alternatives)
         else:
             # Create new alternation
             similar_pattern = self._generate_similar_pattern(node)
-            return AlternationNode(alternatives=[node.clone(), similar_pattern])
+            return AlternationNode(alternatives=[node, similar_pattern])
     
     def _generate_similar_pattern(self, node: PatternNode) -> PatternNode:
         """Generate a pattern similar to the given node."""
         if isinstance(node, LiteralNode):
             # Create similar literal
             if node.value.isalpha():
-                new_char = random.choice(string.ascii_letters)
-                return LiteralNode(new_char)
+                new_char = self.rng.choice(string.ascii_letters)
+                return _LITERAL_NODES[new_char]
             elif node.value.isdigit():
-                new_char = random.choice(string.digits)
-                return LiteralNode(new_char)
+                new_char = self.rng.choice(string.digits)
+                return _LITERAL_NODES[new_char]
             else:
-                return LiteralNode(random.choice(string.printable[:62]))
+                return _LITERAL_NODES[self.rng.choice(_PRINTABLE62_CHARS)]
         
         elif isinstance(node, CharacterClassNode):
             # Create similar character class with some overlap
-            new_chars = set(random.sample(list(node.characters), min(3, len(node.characters))))
-            new_chars.add(random.choice(string.ascii_letters))
+            new_chars = set(self.rng.sample(list(node.characters), min(3, len(node.characters))))
+            new_chars.add(self.rng.choice(string.ascii_letters))
             return CharacterClassNode(characters=new_chars)
         
         else:
             # For complex nodes, just create a simple literal
-            return LiteralNode(random.choice(string.ascii_lowercase))
+            return _LITERAL_NODES[self.rng.choice(string.ascii_lowercase)]
     
     @property
     def name(self) -> str:
         return "alternation"
 
 
+class DeduplicateAlternationMutation(MutationOperator):
+    """Drop alternatives that repeat an earlier branch of the same alternation.
+    
+    Duplicates never change what the pattern matches, only how much the
+    engine backtracks through it. ``PatternMutator`` applies this to every
+    alternation after mutating rather than drawing it at random.
+    """
+    
+    node_types = (AlternationNode,)
+    content_dependent = True
+    
+    def can_apply(self, node: PatternNode) -> bool:
+        if not isinstance(node, AlternationNode):
+            return False
+        regexes = [alt.to_regex() for alt in node.alternatives]
+        return len(set(regexes)) < len(regexes)
+    
+    def apply(self, node: PatternNode) -> PatternNode:
+        if not isinstance(node, AlternationNode):
+            return node
+        
+        seen = set()
+        unique = []
+        for alt in node.alternatives:
+            regex = alt.to_regex()
+            if regex not in seen:
+                seen.add(regex)
+                unique.append(alt)
+        
+        if len(unique) == len(node.alternatives):
+            return node
+        return AlternationNode(alternatives=unique)
+    
+    @property
+    def name(self) -> str:
+        return "deduplicate_alternation"
+
+
 class WildcardMutation(MutationOperator):
     """Convert between wildcard and character classes."""
     
+    node_types = (WildcardNode, CharacterClassNode, LiteralNode)
+    
     def can_apply(self, node: PatternNode) -> bool:
         return isinstance(node, (WildcardNode, CharacterClassNode, LiteralNode))
     
     def apply(self, node: PatternNode) -> PatternNode:
         if isinstance(node, WildcardNode):
             # Convert wildcard to character class
-            char_sets = [
-                set(string.ascii_lowercase),
-                set(string.ascii_uppercase),
-                set(string.digits),
-                set(string.ascii_letters),
-                set(string.printable[:62])
-            ]
-            return CharacterClassNode(characters=random.choice(char_sets))
+            return _CHAR_CLASS_NODES[self.rng.choice(_WILDCARD_CHOICES)]
         
         elif isinstance(node, CharacterClassNode):
             # Sometimes convert to wildcard
-            if random.random() < 0.2:
+            if self.rng.random() < 0.2:
                 return WildcardNode()
             else:
                 return node
@@ -280,8 +360,11 @@ class WildcardMutation(MutationOperator):
 class PatternMutator:
     """Main class for applying mutations to patterns."""
     
-    def __init__(self, mutation_rate: float = 0.1):
+    def __init__(self, mutation_rate: float = 0.1, seed: Optional[int] = None):
         self.mutation_rate = mutation_rate
+        # Private generator shared with the operators, so seeded runs are
+        # reproducible without touching the global random state
+        self._rng = random.Random(seed)
         self.operators = [
             LiteralToCharClassMutation(),
             CharClassToRangeMutation(),
@@ -291,41 +374,104 @@ class PatternMutator:
             AlternationMutation(),
             WildcardMutation(),
         ]
+        for operator in self.operators:
+            operator.rng = self._rng
+        self._deduplicate = DeduplicateAlternationMutation()
+        
+        # Candidate operators per node class, in operator order; built once
+        # from node_types, so edit self.operators before the first mutate()
+        self._ops_by_type: Dict[type, Tuple[MutationOperator, ...]] = {
+            node_type: tuple(
+                op for op in self.operators
+                if op.node_types is None or issubclass(node_type, op.node_types)
+            )
+            for node_type in _NODE_TYPES
+        }
     
     def mutate(self, pattern: PatternAST) -> PatternAST:
-        """Apply random mutations to a pattern."""
-        new_pattern = pattern.clone()
+        """Apply random mutations to a pattern.
         
-        # Collect all nodes in the pattern
-        nodes = self._collect_nodes(new_pattern.root)
+        Nodes are immutable, so the input is never copied: nodes are visited
+        children first, and only the ancestors of a mutated node are rebuilt
+        (copy-on-write) to hold the new subtree. A parent mutation therefore
+        sees its already mutated children. Duplicate alternatives are
+        removed from every alternation before and after its mutation, without
+        drawing from the RNG.
+        """
+        nodes, parents = self._collect_nodes_with_parents(pattern.root)
         
-        # Apply mutations with the given probability
-        for i, node in enumerate(nodes):
-            if random.random() < self.mutation_rate:
-                applicable_ops = [op for op in self.operators if op.can_apply(node)]
-                if applicable_ops:
-                    chosen_op = random.choice(applicable_ops)
-                    mutated_node = chosen_op.apply(node)
-                    nodes[i] = mutated_node
+        # Replacement children per parent index, as {slot: new child}
+        replaced: Dict[int, Dict[int, PatternNode]] = {}
+        root = pattern.root
+        draw = self._rng.random
+        mutation_rate = self.mutation_rate
+        ops_by_type = self._ops_by_type
+        deduplicate = self._deduplicate
         
-        # Rebuild pattern from mutated nodes
-        # For simplicity, if we mutated the root, use that
-        if nodes and len(nodes) > 0:
-            new_pattern.root = nodes[0]
+        for i in range(len(nodes) - 1, -1, -1):
+            node = nodes[i]
+            new_children = replaced.pop(i, None)
+            if new_children:
+                node = _with_children(node, new_children)
+            # Also before mutating, as an operator may wrap the alternation
+            if type(node) is AlternationNode:
+                node = deduplicate.apply(node)
+            
+            if draw() < mutation_rate:
+                candidates = ops_by_type.get(type(node))
+                if candidates is None:
+                    # Unknown node class: ask every operator
+                    applicable_ops = [op for op in self.operators if op.can_apply(node)]
+                else:
+                    applicable_ops = [
+                        op for op in candidates
+                        if not op.content_dependent or op.can_apply(node)
+                    ]
+                if applicable_ops:
+                    chosen_op = self._rng.choice(applicable_ops)
+                    node = chosen_op.apply(node)
+            
+            if type(node) is AlternationNode:
+                node = deduplicate.apply(node)
+            
+            if node is not nodes[i]:
+                parent, slot = parents[i]
+                if parent < 0:
+                    root = node
+                else:
+                    replaced.setdefault(parent, {})[slot] = node
         
-        return new_pattern
+        return PatternAST(root)
     
-    def _collect_nodes(self, root: PatternNode) -> List[PatternNode]:
-        """Collect all nodes in the pattern tree."""
-        nodes = [root]
+    def _collect_nodes_with_parents(
+        self,
+        root: PatternNode
+    ) -> Tuple[List[PatternNode], List[Tuple[int, int]]]:
+        """Collect all nodes in pre-order, with each node's (parent index, child slot).
+        
+        The slot is 0 for the child of a quantifier or group and the position
+        within an alternation; the root's parent index is -1.
+        """
+        nodes = []
+        parents = []
+        stack = [(root, -1, 0)]
+        pop = stack.pop
+        push = stack.append
         
-        if isinstance(root, (QuantifierNode, GroupNode)):
-            nodes.extend(self._collect_nodes(root.child))
-        elif isinstance(root, AlternationNode):
-            for alt in root.alternatives:
-                nodes.extend(self._collect_nodes(alt))
+        while stack:
+            node, parent, slot = pop()
+            index = len(nodes)
+            nodes.append(node)
+            parents.append((parent, slot))
+            node_type = type(node)
+            if node_type is QuantifierNode or node_type is GroupNode:
+                push((node.child, index, 0))
+            elif node_type is AlternationNode:
+                alternatives = node.alternatives
+                for position in range(len(alternatives) - 1, -1, -1):
+                    push((alternatives[position], index, position))
         
-        return nodes
+        return nodes, parents
     
     def generate_random_pattern(self, max_complexity: int = 20, examples: List[str] = None) -> PatternAST:
         """Generate a random pattern, optionally guided by examples."""
@@ -369,13 +515,13 @@ class PatternMutator:
         
         for char_type in analysis.detected_structure[:min(10, len(analysis.detected_structure))]:
             if char_type == 'digit':
-                components.append(CharacterClassNode(characters={'0', '1', '2', '3', '4', '5', '6', '7', '8', '9'}))
+                components.append(_CHAR_CLASS_NODES[_DIGITS])
             elif char_type == 'lower':
-                components.append(CharacterClassNode(characters=set(string.ascii_lowercase)))
+                components.append(_CHAR_CLASS_NODES[_LOWERCASE])
             elif char_type == 'upper':
-                components.append(CharacterClassNode(characters=set(string.ascii_uppercase)))
+                components.append(_CHAR_CLASS_NODES[_UPPERCASE])
             elif char_type == 'alpha':
-                components.append(CharacterClassNode(characters=set(string.ascii_letters)))
+                components.append(_CHAR_CLASS_NODES[_LETTERS])
             else:
                 components.append(WildcardNode())
         
@@ -398,34 +544,34 @@ class PatternMutator:
         """Generate a random pattern node within complexity budget."""
         if complexity_budget <= 1:
             # Generate simple node
-            node_type = random.choice(['literal', 'char_class', 'wildcard'])
+            node_type = self._rng.choice(['literal', 'char_class', 'wildcard'])
             
             if node_type == 'literal':
-                char = random.choice(string.ascii_letters + string.digits)
-                return LiteralNode(char)
+                char = self._rng.choice(_LETTER_DIGIT_CHARS)
+                return _LITERAL_NODES[char]
             elif node_type == 'char_class':
-                chars = set(random.sample(string.ascii_lowercase, random.randint(2, 5)))
+                chars = set(self._rng.sample(string.ascii_lowercase, self._rng.randint(2, 5)))
                 return CharacterClassNode(characters=chars)
             else:  # wildcard
                 return WildcardNode()
         
         else:
             # Generate complex node
-            node_type = random.choice(['quantifier', 'group', 'alternation', 'simple'])
+            node_type = self._rng.choice(['quantifier', 'group', 'alternation', 'simple'])
             
             if node_type == 'quantifier':
                 child = self._generate_random_node(complexity_budget - 2)
-                min_count = random.randint(0, 3)
-                max_count = None if random.random() < 0.3 else random.randint(min_count, min_count + 5)
+                min_count = self._rng.randint(0, 3)
+                max_count = None if self._rng.random() < 0.3 else self._rng.randint(min_count, min_count + 5)
                 return QuantifierNode(child=child, min_count=min_count, max_count=max_count)
             
             elif node_type == 'group':
                 child = self._generate_random_node(complexity_budget - 2)
-                return GroupNode(child=child, capturing=random.choice([True, False]))
+                return GroupNode(child=child, capturing=self._rng.choice([True, False]))
             
             elif node_type == 'alternation':
                 max_alts = max(2, min(4, complexity_budget // 2))
-                num_alts = random.randint(2, max_alts) if max_alts > 2 else 2
+                num_alts = self._rng.randint(2, max_alts) if max_alts > 2 else 2
                 alt_budget = max(1, (complexity_budget - 1) // num_alts)
                 alternatives = [
                     self._generate_random_node(alt_budget) 
@@ -1,14 +1,148 @@
 """Fitness scoring system for evaluating regex patterns."""
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from itertools import repeat
+from typing import List, Optional, Dict, Any, Callable, Tuple
+import heapq
+import os
 import re
 import time
 # import numpy as np  # Optional for now
 
-from regexgen.patterns.ast import PatternAST
+try:
+    # Optional linear-time engine (google-re2) for the performance benchmark
+    import re2
+except ImportError:  # pragma: no cover
+    re2 = None
+
+from regexgen.patterns.ast import (
+    PatternAST, PatternNode, AlternationNode, AnchorNode, LiteralNode, CharacterClassNode,
+    QuantifierNode, compile_regex
+)
+from regexgen.timeouts import call_with_timeout, timeout_available
+
+
+def _has_nested_repetition(root: PatternNode) -> bool:
+    """Whether a repeating quantifier contains another quantifier.
+    
+    Such patterns (e.g. ``(?:a?|b){2,4}+``) can backtrack catastrophically,
+    so their matches run under an interval timer.
+    """
+    stack = [(root, False)]
+    while stack:
+        node, repeated = stack.pop()
+        if isinstance(node, QuantifierNode):
+            if repeated:
+                return True
+            repeated = node.max_count is None or node.max_count > 1
+        stack.extend((child, repeated) for child in node.children())
+    return False
+
+
+def _count_duplicate_alternatives(root: PatternNode) -> int:
+    """Number of alternation branches that repeat an earlier branch's regex."""
+    duplicates = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, AlternationNode):
+            regexes = [alt.to_regex() for alt in node.alternatives]
+            duplicates += len(regexes) - len(set(regexes))
+        stack.extend(node.children())
+    return duplicates
+
+
+def _can_batch_match(root: PatternNode) -> bool:
+    """Whether the pattern matches newline-joined examples line by line.
+    
+    Patterns built from the AST only reach a newline through literals,
+    character classes containing it, or negated classes; ``.`` never does.
+    ``\\B`` is excluded too, as it matches an empty line of a joined buffer
+    but not an empty example on its own.
+    """
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, AnchorNode):
+            if node.anchor_type == '\\B':
+                return False
+        elif isinstance(node, LiteralNode):
+            if '\n' in node.value:
+                return False
+        elif isinstance(node, CharacterClassNode):
+            if node.negated or '\n' in node.characters:
+                return False
+            if any('\\' in (start + end) or start <= '\n' <= end for start, end in node.ranges):
+                return False
+        stack.extend(node.children())
+    return True
+
+
+@lru_cache(maxsize=8192)
+def _compile_linear(regex_str: str) -> Optional[Any]:
+    """Compile a regex with RE2, or None if it is unavailable or rejects the syntax."""
+    if re2 is None:
+        return None
+    options = re2.Options()
+    options.log_errors = False  # rejected syntax is expected, not worth logging
+    try:
+        return re2.compile(regex_str, options)
+    except re2.error:
+        return None
+
+
+def _run_benchmark(compiled_pattern: Any, test_strings: List[str]) -> None:
+    """Run ``fullmatch`` and ``search`` over every test string."""
+    for test_string in test_strings:
+        compiled_pattern.fullmatch(test_string)
+        compiled_pattern.search(test_string)
+
+
+def _count_fullmatches(compiled_pattern: re.Pattern, examples: List[str]) -> int:
+    """Number of examples the pattern matches in full.
+    
+    ``map`` and ``filter`` drive the loop from C, so no Python bytecode runs
+    per example.
+    """
+    return len(list(filter(None, map(compiled_pattern.fullmatch, examples))))
+
+
+# Examples benchmarked by the performance score: the longest ones, since
+# backtracking cost grows with input length
+_PERF_SAMPLE_SIZE = 16
+
+# Readability penalty factors indexed by how far a measure exceeds its
+# allowance; larger excesses fall back to computing the power
+_NEST_PENALTY: Tuple[float, ...] = tuple(0.8 ** i for i in range(32))
+_LEN_PENALTY: Tuple[float, ...] = tuple(0.9 ** (i / 10) for i in range(256))
+_QUANT_PENALTY: Tuple[float, ...] = tuple(0.95 ** i for i in range(64))
+_ALT_PENALTY: Tuple[float, ...] = tuple(0.9 ** i for i in range(64))
+
+
+# Per-process state of score_batch workers, set once by the pool initializer
+_worker_scorer: Optional['FitnessScorer'] = None
+_worker_examples: Tuple[List[str], List[str]] = ([], [])
+
+
+def _init_score_worker(
+    scorer: 'FitnessScorer',
+    positive_examples: List[str],
+    negative_examples: List[str]
+) -> None:
+    """Pool initializer: keep the scorer and examples for every task in this worker."""
+    global _worker_scorer, _worker_examples
+    _worker_scorer = scorer
+    _worker_examples = (positive_examples, negative_examples)
+
+
+def _score_in_worker(pattern: PatternAST, min_required: Optional[float]) -> 'FitnessResult':
+    """Score one pattern against the examples shipped to this worker."""
+    return _worker_scorer.score_with_bound(pattern, *_worker_examples, min_required)
 
 
 class ScoringMode(Enum):
@@ -18,7 +152,7 @@ class ScoringMode(Enum):
     BALANCED = "balanced"    # Balance between minimal and readable
 
 
-@dataclass
+@dataclass(slots=True)
 class FitnessResult:
     """Result of fitness evaluation."""
     total_score: float
@@ -33,6 +167,15 @@ class FitnessResult:
     evaluation_time_ms: float
     timeout_occurred: bool = False
     compilation_error: Optional[str] = None
+    pruned: bool = False  # Scoring stopped early; total_score is only an upper bound
+    
+    def is_perfect(self) -> bool:
+        """Whether every positive example matched and every negative was rejected."""
+        return (
+            not self.pruned and
+            self.positive_matches == self.positive_total and
+            self.negative_matches == self.negative_total
+        )
 
 
 class FitnessScorer(ABC):
@@ -47,6 +190,38 @@ class FitnessScorer(ABC):
     ) -> FitnessResult:
         """Evaluate the fitness of a pattern against examples."""
         pass
+    
+    def score_batch(
+        self,
+        patterns: List[PatternAST],
+        positive_examples: List[str],
+        negative_examples: List[str],
+        min_required: Optional[float] = None
+    ) -> List[FitnessResult]:
+        """Evaluate several patterns against the same examples.
+        
+        Each pattern goes through ``score_with_bound`` with ``min_required``.
+        Subclasses can override this to amortize per-call setup across the batch.
+        """
+        return [
+            self.score_with_bound(pattern, positive_examples, negative_examples, min_required)
+            for pattern in patterns
+        ]
+    
+    def score_with_bound(
+        self,
+        pattern: PatternAST,
+        positive_examples: List[str],
+        negative_examples: List[str],
+        min_required: Optional[float]
+    ) -> FitnessResult:
+        """Evaluate fitness, allowing early exit once ``min_required`` is unreachable.
+        
+        When scoring stops early the result has ``pruned=True`` and its
+        ``total_score`` is an upper bound below ``min_required``. The default
+        implementation never prunes.
+        """
+        return self.score(pattern, positive_examples, negative_examples)
 
 
 class MultiCriteriaScorer(FitnessScorer):
@@ -59,10 +234,35 @@ class MultiCriteriaScorer(FitnessScorer):
         complexity_weight: float = None,
         readability_weight: float = None,
         performance_weight: float = None,
-        timeout_seconds: float = 1.0
+        timeout_seconds: float = 1.0,
+        regex_compiler: Callable[[str], re.Pattern] = compile_regex,
+        result_cache_size: int = 256,
+        correctness_threshold: float = 0.3,
+        max_workers: Optional[int] = 1
     ):
         self.mode = mode
         self.timeout_seconds = timeout_seconds
+        self.regex_compiler = regex_compiler
+        # Below this correctness, readability and performance are scored 0.0
+        # without being evaluated; 0 always evaluates them
+        self.correctness_threshold = correctness_threshold
+        
+        # Processes used by score_batch (None: one per CPU); the pool is
+        # created on first use and rebuilt when the examples change
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_examples_key = None
+        
+        # LRU of complete results keyed by (regex, examples key); 0 disables it
+        self.result_cache_size = result_cache_size
+        self._result_cache: OrderedDict = OrderedDict()
+        self._examples_lists: Optional[Tuple[List[str], List[str]]] = None
+        self._examples_key: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+        # Newline-joined positive and negative examples for batch matching;
+        # None when an example contains a newline itself
+        self._joined_examples: Optional[Tuple[str, str]] = None
+        # Longest examples, the performance benchmark's input
+        self._perf_sample: Optional[List[str]] = None
         
         # Set weights based on mode if not explicitly provided
         if mode == ScoringMode.MINIMAL:
@@ -91,6 +291,28 @@ class MultiCriteriaScorer(FitnessScorer):
         self.readability_weight /= total_weight
         self.performance_weight /= total_weight
     
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes get a serial copy without the pool or cached results
+        state = self.__dict__.copy()
+        state['max_workers'] = 1
+        state['_executor'] = None
+        state['_executor_examples_key'] = None
+        state['_result_cache'] = OrderedDict()
+        return state
+    
+    def close(self) -> None:
+        """Shut down the score_batch worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_examples_key = None
+    
+    def __enter__(self) -> 'MultiCriteriaScorer':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
     def score(
         self,
         pattern: PatternAST,
@@ -98,12 +320,98 @@ class MultiCriteriaScorer(FitnessScorer):
         negative_examples: List[str]
     ) -> FitnessResult:
         """Evaluate pattern fitness using multiple criteria."""
+        return self.score_with_bound(pattern, positive_examples, negative_examples, None)
+    
+    def score_batch(
+        self,
+        patterns: List[PatternAST],
+        positive_examples: List[str],
+        negative_examples: List[str],
+        min_required: Optional[float] = None
+    ) -> List[FitnessResult]:
+        """Evaluate several patterns, spreading them over a process pool.
+        
+        With ``max_workers`` other than 1, patterns missing from the result
+        cache are scored in worker processes. The examples are sent once, when
+        the pool is created, so each task only ships its pattern and
+        ``min_required``. Results come back in input order; complete ones are
+        added to the cache.
+        """
+        max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers <= 1 or len(patterns) < 2:
+            return super().score_batch(patterns, positive_examples, negative_examples, min_required)
+        
+        examples_key = self._get_examples_key(positive_examples, negative_examples)
+        results: List[Optional[FitnessResult]] = [None] * len(patterns)
+        pending = []
+        for index, pattern in enumerate(patterns):
+            cached = self._result_cache.get((pattern.to_regex(), examples_key))
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+        
+        if pending:
+            if self._executor is None or self._executor_examples_key != examples_key:
+                self.close()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_score_worker,
+                    initargs=(self, positive_examples, negative_examples)
+                )
+                self._executor_examples_key = examples_key
+            
+            chunksize = max(1, len(pending) // (max_workers * 4))
+            scored = self._executor.map(
+                _score_in_worker,
+                [patterns[index] for index in pending],
+                repeat(min_required),
+                chunksize=chunksize
+            )
+            for index, result in zip(pending, scored):
+                results[index] = result
+                if self.result_cache_size > 0:
+                    self._cache_result((patterns[index].to_regex(), examples_key), result)
+        
+        return results
+    
+    def score_with_bound(
+        self,
+        pattern: PatternAST,
+        positive_examples: List[str],
+        negative_examples: List[str],
+        min_required: Optional[float]
+    ) -> FitnessResult:
+        """Evaluate pattern fitness, stopping once ``min_required`` is unreachable.
+        
+        Complexity and readability are cheap and scored first; the correctness
+        pass then bails out as soon as the best achievable total (all remaining
+        examples correct, perfect performance) drops below ``min_required``.
+        
+        Complete results are memoized per regex and example set, so patterns
+        that survive many iterations unchanged are only scored once. Patterns
+        whose correctness falls below ``correctness_threshold`` get zero
+        readability and performance without evaluating either.
+        """
         start_time = time.time()
         
+        # One fused walk fills the regex, complexity and nesting depth caches
+        # that the complexity and readability terms read below
+        regex_str, _, _ = pattern.summary()
+        examples_key = self._get_examples_key(positive_examples, negative_examples)
+        cache_key = None
+        if self.result_cache_size > 0:
+            cache_key = (regex_str, examples_key)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                return cached
+        
         # Try to compile the pattern
         try:
-            regex_str = pattern.to_regex()
-            compiled_pattern = re.compile(regex_str)
+            compiled_pattern = self.regex_compiler(regex_str)
         except re.error as e:
             return FitnessResult(
                 total_score=0.0,
@@ -119,70 +427,273 @@ class MultiCriteriaScorer(FitnessScorer):
                 compilation_error=str(e)
             )
         
-        # Evaluate correctness
-        correctness_result = self._evaluate_correctness(
-            compiled_pattern, positive_examples, negative_examples
-        )
-        
         # Evaluate complexity
         complexity_score = self._evaluate_complexity(pattern)
         
-        # Evaluate readability
-        readability_score = self._evaluate_readability(pattern, regex_str)
-        
-        # Evaluate performance
-        performance_result = self._evaluate_performance(
-            compiled_pattern, positive_examples + negative_examples
+        # Evaluate correctness, with the non-correctness terms at their best case
+        # to bound the achievable total; readability is only needed up front
+        # for the bound
+        readability_score = None
+        correctness_min = None
+        if min_required is not None:
+            readability_score = self._evaluate_readability(pattern, regex_str)
+            best_other_terms = (
+                self.complexity_weight * complexity_score +
+                self.readability_weight * readability_score +
+                self.performance_weight
+            )
+            correctness_min = (min_required - best_other_terms) / self.correctness_weight
+        
+        # Match all examples in one call per list when the joined buffers can
+        # stand in for the individual strings
+        batch_pattern = None
+        if self._joined_examples is not None and _can_batch_match(pattern.root):
+            try:
+                batch_pattern = self.regex_compiler(f"(?m)^(?:{regex_str})$")
+            except re.error:
+                pass
+        
+        correctness_args = (
+            compiled_pattern, positive_examples, negative_examples, correctness_min, batch_pattern
         )
+        try:
+            if _has_nested_repetition(pattern.root) and timeout_available():
+                # The whole pass shares one timeout_seconds budget
+                correctness_score, positive_matches, negative_matches, pruned = call_with_timeout(
+                    self.timeout_seconds, self._evaluate_correctness, *correctness_args
+                )
+            else:
+                correctness_score, positive_matches, negative_matches, pruned = (
+                    self._evaluate_correctness(*correctness_args)
+                )
+        except TimeoutError:
+            # Catastrophic backtracking: score like an invalid pattern. The
+            # result is not cached, as a timeout depends on machine load
+            return FitnessResult(
+                total_score=0.0,
+                correctness_score=0.0,
+                complexity_score=complexity_score,
+                readability_score=0.0,
+                performance_score=0.0,
+                positive_matches=0,
+                negative_matches=0,
+                positive_total=len(positive_examples),
+                negative_total=len(negative_examples),
+                evaluation_time_ms=(time.time() - start_time) * 1000,
+                timeout_occurred=True
+            )
+        
+        if pruned:
+            return FitnessResult(
+                total_score=(
+                    self.correctness_weight * correctness_score +
+                    self.complexity_weight * complexity_score +
+                    self.readability_weight * readability_score +
+                    self.performance_weight
+                ),
+                correctness_score=correctness_score,
+                complexity_score=complexity_score,
+                readability_score=readability_score,
+                performance_score=0.0,
+                positive_matches=positive_matches,
+                negative_matches=negative_matches,
+                positive_total=len(positive_examples),
+                negative_total=len(negative_examples),
+                evaluation_time_ms=(time.time() - start_time) * 1000,
+                pruned=True
+            )
+        
+        if correctness_score < self.correctness_threshold:
+            # Too wrong for style to matter; skip both remaining evaluations
+            readability_score = 0.0
+            performance_score, timeout_occurred = 0.0, False
+        else:
+            if readability_score is None:
+                readability_score = self._evaluate_readability(pattern, regex_str)
+            
+            # Evaluate performance
+            performance_score, timeout_occurred = self._evaluate_performance(
+                compiled_pattern, self._perf_sample
+            )
         
         # Calculate total score
         total_score = (
-            self.correctness_weight * correctness_result['score'] +
+            self.correctness_weight * correctness_score +
             self.complexity_weight * complexity_score +
             self.readability_weight * readability_score +
-            self.performance_weight * performance_result['score']
+            self.performance_weight * performance_score
         )
         
         evaluation_time = (time.time() - start_time) * 1000
         
-        return FitnessResult(
+        result = FitnessResult(
             total_score=total_score,
-            correctness_score=correctness_result['score'],
+            correctness_score=correctness_score,
             complexity_score=complexity_score,
             readability_score=readability_score,
-            performance_score=performance_result['score'],
-            positive_matches=correctness_result['positive_matches'],
-            negative_matches=correctness_result['negative_matches'],
+            performance_score=performance_score,
+            positive_matches=positive_matches,
+            negative_matches=negative_matches,
             positive_total=len(positive_examples),
             negative_total=len(negative_examples),
             evaluation_time_ms=evaluation_time,
-            timeout_occurred=performance_result['timeout_occurred']
+            timeout_occurred=timeout_occurred
         )
+        
+        self._cache_result(cache_key, result)
+        return result
+    
+    def _cache_result(self, cache_key: Optional[Tuple[str, Any]], result: FitnessResult) -> None:
+        """Store a complete result in the LRU, evicting the oldest entry when full.
+        
+        Pruned results are not stored, and neither are results with
+        ``timeout_occurred`` set, so a pattern that timed out under load is
+        scored again next time.
+        """
+        if cache_key is None or result.pruned or result.timeout_occurred:
+            return
+        if len(self._result_cache) >= self.result_cache_size:
+            self._result_cache.popitem(last=False)
+        self._result_cache[cache_key] = result
+    
+    def _get_examples_key(
+        self,
+        positive_examples: List[str],
+        negative_examples: List[str]
+    ) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Hashable key for an example set, rebuilt only when the lists change.
+        
+        A search passes the same two lists to every call, so the key (and the
+        joined example buffers and performance sample) are reused while the
+        list objects and their lengths stay the same.
+        """
+        lists = self._examples_lists
+        if (lists is None or
+            lists[0] is not positive_examples or
+            lists[1] is not negative_examples or
+            len(self._examples_key[0]) != len(positive_examples) or
+            len(self._examples_key[1]) != len(negative_examples)):
+            self._examples_lists = (positive_examples, negative_examples)
+            self._examples_key = (tuple(positive_examples), tuple(negative_examples))
+            self._perf_sample = heapq.nlargest(
+                _PERF_SAMPLE_SIZE, [*positive_examples, *negative_examples], key=len
+            )
+            if any('\n' in example for example in self._examples_key[0] + self._examples_key[1]):
+                self._joined_examples = None
+            else:
+                self._joined_examples = ("\n".join(positive_examples), "\n".join(negative_examples))
+        return self._examples_key
     
     def _evaluate_correctness(
         self,
         compiled_pattern: re.Pattern,
         positive_examples: List[str],
-        negative_examples: List[str]
-    ) -> Dict[str, Any]:
-        """Evaluate how well the pattern matches the examples."""
+        negative_examples: List[str],
+        min_score: Optional[float] = None,
+        batch_pattern: Optional[re.Pattern] = None
+    ) -> Tuple[float, int, int, bool]:
+        """Evaluate how well the pattern matches the examples.
+        
+        Returns ``(score, positive_matches, negative_matches, pruned)``.
+        
+        If ``min_score`` is given, stop at the first failure after which even
+        getting every remaining example right cannot reach it. The returned
+        score is then that upper bound and ``pruned`` is set.
+        
+        ``batch_pattern`` is the pattern wrapped as ``(?m)^(?:...)$``; when
+        given, each example list is matched with a single ``findall`` over its
+        newline-joined buffer instead of one ``fullmatch`` per example. The
+        caller must ensure neither the pattern nor the examples can match
+        across a newline. Exact scores below ``min_score`` are then reported
+        as pruned.
+        """
         positive_matches = 0
         negative_matches = 0
+        total_positive = len(positive_examples)
+        total_negative = len(negative_examples)
+        
+        if batch_pattern is not None:
+            joined_positive, joined_negative = self._joined_examples
+            if total_positive:
+                positive_matches = len(batch_pattern.findall(joined_positive))
+            if total_negative:
+                negative_matches = total_negative - len(batch_pattern.findall(joined_negative))
+            score = self._correctness_score(
+                positive_matches, negative_matches, total_positive, total_negative
+            )
+            return (
+                score,
+                positive_matches,
+                negative_matches,
+                min_score is not None and score < min_score
+            )
+        
+        if min_score is None:
+            # Nothing to prune against, so count each list in one call
+            positive_matches = _count_fullmatches(compiled_pattern, positive_examples)
+            negative_matches = total_negative - _count_fullmatches(compiled_pattern, negative_examples)
+            return (
+                self._correctness_score(
+                    positive_matches, negative_matches, total_positive, total_negative
+                ),
+                positive_matches,
+                negative_matches,
+                False
+            )
         
         # Test positive examples (should match)
-        for example in positive_examples:
+        for index, example in enumerate(positive_examples):
             if compiled_pattern.fullmatch(example):
                 positive_matches += 1
+            else:
+                # The bound only drops on a failure, so only check here
+                remaining = total_positive - index - 1
+                bound = self._correctness_score(
+                    positive_matches + remaining, total_negative, total_positive, total_negative
+                )
+                if bound < min_score:
+                    return (
+                        bound,
+                        positive_matches,
+                        negative_matches,
+                        True
+                    )
         
         # Test negative examples (should NOT match)
-        for example in negative_examples:
+        for index, example in enumerate(negative_examples):
             if not compiled_pattern.fullmatch(example):
                 negative_matches += 1
-        
+            else:
+                remaining = total_negative - index - 1
+                bound = self._correctness_score(
+                    positive_matches, negative_matches + remaining, total_positive, total_negative
+                )
+                if bound < min_score:
+                    return (
+                        bound,
+                        positive_matches,
+                        negative_matches,
+                        True
+                    )
+        
+        return (
+            self._correctness_score(
+                positive_matches, negative_matches, total_positive, total_negative
+            ),
+            positive_matches,
+            negative_matches,
+            False
+        )
+    
+    def _correctness_score(
+        self,
+        positive_matches: int,
+        negative_matches: int,
+        total_positive: int,
+        total_negative: int
+    ) -> float:
+        """Combine match counts into a correctness score (monotone in both counts)."""
         # Calculate correctness score with heavy emphasis on positive matches
-        total_positive = len(positive_examples)
-        total_negative = len(negative_examples)
-        
         if total_positive == 0 and total_negative == 0:
             score = 1.0
         elif total_positive == 0:
@@ -200,11 +711,7 @@ class MultiCriteriaScorer(FitnessScorer):
             if positive_matches == 0:
                 score *= 0.1
         
-        return {
-            'score': score,
-            'positive_matches': positive_matches,
-            'negative_matches': negative_matches
-        }
+        return score
     
     def _evaluate_complexity(self, pattern: PatternAST) -> float:
         """Evaluate pattern complexity (lower is better)."""
@@ -225,21 +732,33 @@ class MultiCriteriaScorer(FitnessScorer):
         # Penalize deeply nested structures
         nesting_depth = self._calculate_nesting_depth(pattern)
         if nesting_depth > 3:
-            readability_score *= 0.8 ** (nesting_depth - 3)
+            excess = nesting_depth - 3
+            readability_score *= _NEST_PENALTY[excess] if excess < 32 else 0.8 ** excess
         
         # Penalize very long patterns
-        if len(regex_str) > 50:
-            readability_score *= 0.9 ** ((len(regex_str) - 50) / 10)
+        length = len(regex_str)
+        if length > 50:
+            excess = length - 50
+            readability_score *= _LEN_PENALTY[excess] if excess < 256 else 0.9 ** (excess / 10)
         
-        # Penalize complex quantifiers
+        # Penalize complex quantifiers; str.count is a C-level scan, faster
+        # than a Python tally of both characters or counting on encoded bytes
         complex_quantifier_count = regex_str.count('{')
         if complex_quantifier_count > 2:
-            readability_score *= 0.95 ** (complex_quantifier_count - 2)
+            excess = complex_quantifier_count - 2
+            readability_score *= _QUANT_PENALTY[excess] if excess < 64 else 0.95 ** excess
         
         # Penalize excessive alternations
         alternation_count = regex_str.count('|')
         if alternation_count > 3:
-            readability_score *= 0.9 ** (alternation_count - 3)
+            excess = alternation_count - 3
+            readability_score *= _ALT_PENALTY[excess] if excess < 64 else 0.9 ** excess
+            
+        # Penalize repeated branches within an alternation, e.g. (a|b|a)
+        if alternation_count:
+            duplicate_count = _count_duplicate_alternatives(pattern.root)
+            if duplicate_count:
+                readability_score *= 0.5 ** duplicate_count
         
         return max(0.0, min(1.0, readability_score))
     
@@ -247,26 +766,45 @@ class MultiCriteriaScorer(FitnessScorer):
         self,
         compiled_pattern: re.Pattern,
         test_strings: List[str]
-    ) -> Dict[str, Any]:
-        """Evaluate pattern performance (execution speed)."""
+    ) -> Tuple[float, bool]:
+        """Evaluate pattern performance as ``(score, timeout_occurred)``.
+        
+        Patterns RE2 accepts run on it when installed: it matches in linear
+        time, so the benchmark needs no timeout checks at all. Otherwise, on
+        POSIX main threads, the whole benchmark runs under an interval timer
+        of ``timeout_seconds``, which cuts a catastrophic backtrack off
+        mid-match. Elsewhere the clock is checked between test strings.
+        """
         if not test_strings:
-            return {'score': 1.0, 'timeout_occurred': False}
+            return 1.0, False
         
         start_time = time.time()
         timeout_occurred = False
         
         try:
-            # Test pattern against a subset of strings
-            test_sample = test_strings[:min(100, len(test_strings))]
+            # Callers pass a small sample (see _PERF_SAMPLE_SIZE), so every
+            # string is benchmarked
+            test_sample = test_strings
+            linear_pattern = _compile_linear(compiled_pattern.pattern)
             
-            for test_string in test_sample:
-                if time.time() - start_time > self.timeout_seconds:
+            if linear_pattern is not None:
+                _run_benchmark(linear_pattern, test_sample)
+            elif timeout_available():
+                try:
+                    call_with_timeout(
+                        self.timeout_seconds, _run_benchmark, compiled_pattern, test_sample
+                    )
+                except TimeoutError:
                     timeout_occurred = True
-                    break
-                
-                # Test both fullmatch and search to detect potential backtracking
-                compiled_pattern.fullmatch(test_string)
-                compiled_pattern.search(test_string)
+            else:
+                for test_string in test_sample:
+                    if time.time() - start_time > self.timeout_seconds:
+                        timeout_occurred = True
+                        break
+                    
+                    # Test both fullmatch and search to detect potential backtracking
+                    compiled_pattern.fullmatch(test_string)
+                    compiled_pattern.search(test_string)
             
             execution_time = time.time() - start_time
             
@@ -284,29 +822,19 @@ class MultiCriteriaScorer(FitnessScorer):
             score = 0.0
             timeout_occurred = True
         
-        return {
-            'score': score,
-            'timeout_occurred': timeout_occurred
-        }
+        return score, timeout_occurred
     
     def _calculate_nesting_depth(self, pattern: PatternAST) -> int:
-        """Calculate the maximum nesting depth of the pattern."""
-        from regexgen.patterns.ast import GroupNode, QuantifierNode
-        
-        def _depth(node, current_depth=0):
-            if isinstance(node, (GroupNode, QuantifierNode)):
-                return _depth(node.child, current_depth + 1)
-            elif hasattr(node, 'alternatives'):  # AlternationNode
-                return max(_depth(alt, current_depth) for alt in node.alternatives)
-            else:
-                return current_depth
-        
-        return _depth(pattern.root)
+        """Calculate the maximum nesting depth of the pattern (memoized on the AST)."""
+        return pattern.nesting_depth()
 
 
 class SimpleFitnessScorer(FitnessScorer):
     """Simple fitness scorer that only considers correctness."""
     
+    def __init__(self, regex_compiler: Callable[[str], re.Pattern] = compile_regex):
+        self.regex_compiler = regex_compiler
+    
     def score(
         self,
         pattern: PatternAST,
@@ -318,7 +846,7 @@ class SimpleFitnessScorer(FitnessScorer):
         
         try:
             regex_str = pattern.to_regex()
-            compiled_pattern = re.compile(regex_str)
+            compiled_pattern = self.regex_compiler(regex_str)
         except re.error as e:
             return FitnessResult(
                 total_score=0.0,
@@ -334,15 +862,8 @@ class SimpleFitnessScorer(FitnessScorer):
                 compilation_error=str(e)
             )
         
-        positive_matches = sum(
-            1 for ex in positive_examples 
-            if compiled_pattern.fullmatch(ex)
-        )
-        
-        negative_matches = sum(
-            1 for ex in negative_examples 
-            if not compiled_pattern.fullmatch(ex)
-        )
+        positive_matches = _count_fullmatches(compiled_pattern, positive_examples)
+        negative_matches = len(negative_examples) - _count_fullmatches(compiled_pattern, negative_examples)
         
         total_correct = positive_matches + negative_matches
         total_examples = len(positive_examples) + len(negative_examples)
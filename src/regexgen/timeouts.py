@@ -0,0 +1,44 @@
+"""Interval-timer timeouts for regex matching."""
+
+import signal
+import threading
+import time
+from typing import Any, Callable
+
+# Delay for re-arming an outer timer whose deadline passed during a call
+_EXPIRED_DELAY_SECONDS = 1e-6
+
+
+def _raise_timeout(signum, frame):
+    """SIGALRM handler; the regex engine checks for signals while matching."""
+    raise TimeoutError("Pattern execution timed out")
+
+
+def timeout_available() -> bool:
+    """Whether ``call_with_timeout`` can run here (POSIX, main thread)."""
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def call_with_timeout(seconds: float, function: Callable[..., Any], *args: Any) -> Any:
+    """Call ``function(*args)``, raising ``TimeoutError`` after ``seconds``.
+
+    Uses SIGALRM and ITIMER_REAL, so it only runs where ``timeout_available()``.
+    The caller's SIGALRM handler and any timer it had armed are restored
+    afterwards; the timer keeps its original deadline, and fires straight
+    away if that passed during the call.
+    """
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    previous_delay, previous_interval = signal.getitimer(signal.ITIMER_REAL)
+    start_time = time.monotonic()
+    try:
+        # Armed inside the try, so a timer that fires at once still restores
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        return function(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+        if previous_delay > 0:
+            remaining = previous_delay - (time.monotonic() - start_time)
+            signal.setitimer(
+                signal.ITIMER_REAL, max(remaining, _EXPIRED_DELAY_SECONDS), previous_interval
+            )
@@ -5,16 +5,15 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-def test_simple_digit_case():
+from conftest import load_regexgen_api, shared_scorer
+
+def test_simple_digit_case(regexgen_api):
     """Test the simplest possible case."""
     try:
-        from regexgen.algorithms.simulated_annealing import SimulatedAnnealing, SAConfig
-        from regexgen.scoring.fitness import MultiCriteriaScorer, ScoringMode
-        
         positives = ["123", "456", "789"]
         negatives = ["abc", "12a"]
         
-        config = SAConfig(
+        config = regexgen_api.SAConfig(
             max_iterations=50,
             max_complexity=20,
             timeout_seconds=3,
@@ -22,8 +21,8 @@ def test_simple_digit_case():
             max_no_improvement=20
         )
         
-        optimizer = SimulatedAnnealing(config)
-        scorer = MultiCriteriaScorer(mode=ScoringMode.BALANCED)
+        optimizer = regexgen_api.SimulatedAnnealing(config)
+        scorer = shared_scorer(regexgen_api.ScoringMode.BALANCED)
         
         print("🔬 Simple Digit Test:")
         print(f"  Positives: {positives}")
@@ -59,17 +58,14 @@ def test_simple_digit_case():
         traceback.print_exc()
         return False
 
-def test_pattern_generation():
+def test_pattern_generation(regexgen_api):
     """Test just the pattern generation."""
     try:
-        from regexgen.patterns.mutations import PatternMutator
-        from regexgen.patterns.analysis import PatternAnalyzer
-        
         print("\n🧬 Pattern Generation Test:")
         
         # Test digit analysis
         examples = ["123", "456", "789"]
-        analyzer = PatternAnalyzer()
+        analyzer = regexgen_api.PatternAnalyzer()
         analysis = analyzer.analyze_examples(examples)
         
         print(f"  Examples: {examples}")
@@ -81,7 +77,7 @@ def test_pattern_generation():
         print(f"  Initial pattern: {initial_pattern.to_regex()}")
         
         # Test mutation
-        mutator = PatternMutator()
+        mutator = regexgen_api.PatternMutator()
         guided_pattern = mutator.generate_random_pattern(max_complexity=20, examples=examples)
         print(f"  Guided pattern: {guided_pattern.to_regex()}")
         
@@ -98,8 +94,14 @@ if __name__ == "__main__":
     print("⚡ Quick Algorithm Improvement Test")
     print("=" * 40)
     
-    success1 = test_pattern_generation()
-    success2 = test_simple_digit_case()
+    try:
+        regexgen_api = load_regexgen_api()
+    except ImportError as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(1)
+    
+    success1 = test_pattern_generation(regexgen_api)
+    success2 = test_simple_digit_case(regexgen_api)
     
     print("\n" + "=" * 40)
     if success1 and success2:
@@ -0,0 +1,94 @@
+"""Unit tests for the pattern AST."""
+
+import random
+import re
+
+import pytest
+
+from regexgen.patterns.ast import (
+    AlternationNode, AnchorNode, CharacterClassNode, GroupNode, LiteralNode, PatternAST,
+    QuantifierNode
+)
+from regexgen.patterns.mutations import PatternMutator
+
+
+def _compiles(regex):
+    try:
+        re.compile(regex)
+    except re.error:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("characters, expected", [
+    ("abc", "[a-c]"),
+    ("ab", "[ab]"),
+    ("abd", "[abd]"),
+    ("xyz0123", "[0-3x-z]"),
+    ("abcdefghij", "[a-j]"),
+])
+def test_character_class_emits_runs_of_three_as_ranges(characters, expected):
+    assert CharacterClassNode(frozenset(characters)).to_regex() == expected
+
+
+def test_character_class_escapes_range_endpoints():
+    node = CharacterClassNode(frozenset("\\]^"))
+    assert node.to_regex() == "[\\\\-\\^]"
+    assert re.compile(node.to_regex()).fullmatch("]")
+
+
+def test_character_class_keeps_explicit_ranges_and_negation():
+    assert CharacterClassNode(frozenset("x"), ranges=[("a", "f")]).to_regex() == "[xa-f]"
+    assert CharacterClassNode(frozenset("abc"), negated=True).to_regex() == "[^a-c]"
+
+
+def test_code_runs_match_sorted_scan_across_bitmap_span():
+    rng = random.Random(7)
+    for _ in range(200):
+        codes = rng.sample(range(0x20, 0x3000), rng.randint(1, 40))
+        node = CharacterClassNode(frozenset(map(chr, codes)))
+        expected = []
+        for code in sorted(codes):
+            if expected and code == expected[-1][1] + 1:
+                expected[-1] = (expected[-1][0], code)
+            else:
+                expected.append((code, code))
+        assert node.code_runs() == expected
+
+
+def test_character_class_matches_exactly_its_characters():
+    rng = random.Random(11)
+    alphabet = "abcdefxyz0123456789-^]\\"
+    for _ in range(200):
+        chars = frozenset(rng.sample(alphabet, rng.randint(1, len(alphabet))))
+        compiled = re.compile(CharacterClassNode(chars).to_regex())
+        assert {c for c in alphabet if compiled.fullmatch(c)} == chars
+
+
+@pytest.mark.parametrize("root", [
+    QuantifierNode(QuantifierNode(LiteralNode("a"), 1, None), 0, 1),
+    QuantifierNode(QuantifierNode(LiteralNode("a"), 1, None), 1, None),
+    QuantifierNode(QuantifierNode(LiteralNode("a"), 0, None), 0, None),
+    QuantifierNode(LiteralNode("a"), 3, 2),
+    QuantifierNode(AnchorNode("^"), 0, None),
+    CharacterClassNode(frozenset(), ranges=[("z", "a")]),
+    GroupNode(LiteralNode("a"), capturing=True, name="1x"),
+    AlternationNode([
+        GroupNode(LiteralNode("a"), capturing=True, name="n"),
+        GroupNode(LiteralNode("b"), capturing=True, name="n"),
+    ]),
+], ids=lambda root: root.to_regex())
+def test_is_structurally_valid_agrees_with_re_compile(root):
+    pattern = PatternAST(root)
+    assert pattern.is_structurally_valid() == _compiles(pattern.to_regex())
+
+
+def test_is_structurally_valid_agrees_on_mutated_patterns():
+    mutator = PatternMutator(seed=1)
+    examples = ["abc123", "foo_bar", "x-y", "2024-01-02", "hello world"]
+    patterns = [mutator.generate_random_pattern(max_complexity=20, examples=examples)
+                for _ in range(50)]
+    for _ in range(20):
+        patterns = [mutator.mutate(pattern) for pattern in patterns]
+        for pattern in patterns:
+            assert pattern.is_structurally_valid() == _compiles(pattern.to_regex()), pattern.to_regex()
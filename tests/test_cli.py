@@ -0,0 +1,20 @@
+"""Unit tests for the command-line interface."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from regexgen.cli.main import cli
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_parallel_tempering_runs_from_the_cli(jobs):
+    result = CliRunner().invoke(cli, [
+        "--algorithm", "pt", "-j", jobs, "--max-iterations", "20", "--seed", "1",
+        "--json", "-q", "abc", "abd"
+    ])
+    assert result.exit_code == 0, result.output
+    output = json.loads(result.output)
+    assert output["algorithm"] == "pt"
+    assert ("restart" in output["convergence_reason"]) == (jobs != "1")
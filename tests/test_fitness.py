@@ -0,0 +1,162 @@
+"""Unit tests for fitness scoring."""
+
+import re
+
+from regexgen.patterns.ast import (
+    AlternationNode, CharacterClassNode, GroupNode, LiteralNode, PatternAST, QuantifierNode
+)
+from regexgen.patterns.mutations import PatternMutator
+from regexgen.scoring.fitness import (
+    MultiCriteriaScorer, _can_batch_match, _count_duplicate_alternatives, _has_nested_repetition
+)
+
+
+POSITIVES = ["abc123", "foo_bar", "x-y", "2024-01-02", "hello world", "", "A"]
+NEGATIVES = ["abc", "123", "foo bar", "2024/01/02", " ", "zz"]
+
+
+def _mutated_patterns(count=60, rounds=15, seed=3):
+    mutator = PatternMutator(seed=seed)
+    patterns = [mutator.generate_random_pattern(max_complexity=20, examples=POSITIVES)
+                for _ in range(count)]
+    seen = []
+    for _ in range(rounds):
+        patterns = [mutator.mutate(pattern) for pattern in patterns]
+        seen.extend(patterns)
+    return seen
+
+
+def _compiled(pattern):
+    try:
+        return re.compile(pattern.to_regex())
+    except re.error:
+        return None
+
+
+def _deterministic_fields(result):
+    # Performance (and so the total) depends on timing
+    return (
+        result.correctness_score, result.complexity_score, result.readability_score,
+        result.positive_matches, result.negative_matches,
+        result.positive_total, result.negative_total, result.compilation_error
+    )
+
+
+def _word_pattern():
+    return PatternAST(QuantifierNode(CharacterClassNode(frozenset("abcdefoz_")), 1, None))
+
+
+def test_cached_result_equals_fresh_result():
+    scorer = MultiCriteriaScorer()
+    first = scorer.score(_word_pattern(), POSITIVES, NEGATIVES)
+    assert scorer.score(_word_pattern(), list(POSITIVES), list(NEGATIVES)) is first
+    fresh = MultiCriteriaScorer(result_cache_size=0).score(_word_pattern(), POSITIVES, NEGATIVES)
+    assert _deterministic_fields(first) == _deterministic_fields(fresh)
+
+
+def test_result_cache_is_keyed_on_example_set():
+    scorer = MultiCriteriaScorer()
+    pattern = _word_pattern()
+    matching = scorer.score(pattern, ["abc"], ["123"])
+    swapped = scorer.score(pattern, ["123"], ["abc"])
+    assert swapped is not matching
+    assert (matching.positive_matches, matching.negative_matches) == (1, 1)
+    assert (swapped.positive_matches, swapped.negative_matches) == (0, 0)
+    assert scorer.score(pattern, ["abc"], ["123"]) is matching
+
+
+def test_batch_matching_counts_equal_per_example_fullmatch():
+    scorer = MultiCriteriaScorer(result_cache_size=0)
+    batched = 0
+    for pattern in _mutated_patterns():
+        compiled = _compiled(pattern)
+        # Nested repetition is matched under a timeout instead, and may not
+        # finish under re at all
+        if compiled is None or _has_nested_repetition(pattern.root):
+            continue
+        batched += _can_batch_match(pattern.root)
+        result = scorer.score(pattern, POSITIVES, NEGATIVES)
+        if result.timeout_occurred:
+            continue
+        assert result.positive_matches == sum(
+            1 for example in POSITIVES if compiled.fullmatch(example)
+        ), pattern.to_regex()
+        assert result.negative_matches == sum(
+            1 for example in NEGATIVES if not compiled.fullmatch(example)
+        ), pattern.to_regex()
+    assert batched > 0
+
+
+def test_examples_with_newlines_fall_back_to_fullmatch():
+    # A joined buffer cannot stand in for examples that contain newlines
+    scorer = MultiCriteriaScorer(result_cache_size=0)
+    pattern = PatternAST.from_string(".*")
+    result = scorer.score(pattern, ["ab", "a b"], ["a\nb"])
+    assert scorer._joined_examples is None
+    assert result.positive_matches == 2
+    assert result.negative_matches == 1
+
+
+def test_bounded_and_unbounded_scores_agree_when_not_pruned():
+    scorer = MultiCriteriaScorer(result_cache_size=0)
+    for pattern in _mutated_patterns(count=20, rounds=5):
+        if _compiled(pattern) is None:
+            continue
+        full = scorer.score(pattern, POSITIVES, NEGATIVES)
+        bounded = scorer.score_with_bound(pattern, POSITIVES, NEGATIVES, 0.0)
+        if full.timeout_occurred or bounded.timeout_occurred:
+            continue
+        assert not bounded.pruned
+        assert (bounded.positive_matches, bounded.negative_matches) == (
+            full.positive_matches, full.negative_matches
+        )
+
+
+def test_nested_repetition_is_detected_under_repeating_quantifiers_only():
+    inner = QuantifierNode(LiteralNode("a"), 1, None)
+    assert _has_nested_repetition(QuantifierNode(GroupNode(inner, capturing=False), 1, None))
+    assert _has_nested_repetition(QuantifierNode(GroupNode(inner, capturing=False), 2, 3))
+    assert not _has_nested_repetition(QuantifierNode(GroupNode(inner, capturing=False), 0, 1))
+    assert not _has_nested_repetition(inner)
+
+
+def _pool_patterns():
+    return [pattern for pattern in _mutated_patterns(count=10, rounds=2)
+            if not _has_nested_repetition(pattern.root)]
+
+
+def test_pool_results_equal_serial_results_in_input_order():
+    patterns = _pool_patterns()
+    serial = MultiCriteriaScorer(result_cache_size=0).score_batch(patterns, POSITIVES, NEGATIVES)
+    scorer = MultiCriteriaScorer(max_workers=2, result_cache_size=0)
+    try:
+        pooled = scorer.score_batch(patterns, POSITIVES, NEGATIVES)
+    finally:
+        scorer.close()
+    assert list(map(_deterministic_fields, pooled)) == list(map(_deterministic_fields, serial))
+
+
+def test_pool_is_rebuilt_when_examples_change():
+    patterns = _pool_patterns()
+    scorer = MultiCriteriaScorer(max_workers=2, result_cache_size=0)
+    try:
+        scorer.score_batch(patterns, POSITIVES, NEGATIVES)
+        executor = scorer._executor
+        scorer.score_batch(patterns, POSITIVES, NEGATIVES)
+        assert scorer._executor is executor
+        swapped = scorer.score_batch(patterns, NEGATIVES, POSITIVES)
+        assert scorer._executor is not executor
+    finally:
+        scorer.close()
+    serial = MultiCriteriaScorer(result_cache_size=0).score_batch(patterns, NEGATIVES, POSITIVES)
+    assert list(map(_deterministic_fields, swapped)) == list(map(_deterministic_fields, serial))
+
+
+def test_duplicate_alternatives_lower_readability():
+    scorer = MultiCriteriaScorer(result_cache_size=0)
+    unique = PatternAST(AlternationNode([LiteralNode("a"), LiteralNode("b")]))
+    repeated = PatternAST(AlternationNode([LiteralNode("a"), LiteralNode("b"), LiteralNode("a")]))
+    assert _count_duplicate_alternatives(repeated.root) == 1
+    assert _count_duplicate_alternatives(unique.root) == 0
+    assert (scorer._evaluate_readability(repeated, repeated.to_regex()) <
+            scorer._evaluate_readability(unique, unique.to_regex()))
@@ -0,0 +1,63 @@
+"""Unit tests for pattern mutations."""
+
+import re
+
+from regexgen.patterns.ast import AlternationNode, GroupNode, LiteralNode, PatternAST
+from regexgen.patterns.mutations import DeduplicateAlternationMutation, PatternMutator
+
+
+def _alternation(*values):
+    return AlternationNode([LiteralNode(value) for value in values])
+
+
+def test_deduplicate_alternation_keeps_first_occurrences_in_order():
+    operator = DeduplicateAlternationMutation()
+    node = _alternation("b", "a", "b", "c", "a")
+    assert operator.can_apply(node)
+    assert operator.apply(node).to_regex() == "b|a|c"
+
+
+def test_deduplicate_alternation_preserves_matches():
+    node = _alternation("ab", "a", "ab", "b")
+    deduplicated = DeduplicateAlternationMutation().apply(node)
+    before = re.compile(node.to_regex())
+    after = re.compile(deduplicated.to_regex())
+    for example in ["a", "b", "ab", "ba", ""]:
+        assert bool(before.fullmatch(example)) == bool(after.fullmatch(example))
+
+
+def test_deduplicate_alternation_leaves_unique_branches_alone():
+    operator = DeduplicateAlternationMutation()
+    node = _alternation("a", "b")
+    assert not operator.can_apply(node)
+    assert operator.apply(node) is node
+
+
+def test_inner_node_mutations_are_kept():
+    mutator = PatternMutator(mutation_rate=0.5, seed=0)
+    alternation = _alternation("a", "b")
+    pattern = PatternAST(GroupNode(alternation, capturing=False))
+    roots = [mutator.mutate(pattern).root for _ in range(100)]
+    # A mutation of the group itself never leaves it around a changed alternation
+    assert any(
+        isinstance(root, GroupNode) and isinstance(root.child, AlternationNode) and
+        root.child != alternation
+        for root in roots
+    )
+    assert pattern.root.child is alternation
+
+
+def test_mutated_patterns_have_no_duplicate_alternatives():
+    mutator = PatternMutator(seed=5)
+    base = PatternAST(GroupNode(_alternation("a", "b", "a"), capturing=False))
+    patterns = [base] * 100
+    for _ in range(10):
+        patterns = [mutator.mutate(pattern) for pattern in patterns]
+        for pattern in patterns:
+            stack = [pattern.root]
+            while stack:
+                node = stack.pop()
+                if isinstance(node, AlternationNode):
+                    regexes = [alt.to_regex() for alt in node.alternatives]
+                    assert len(regexes) == len(set(regexes)), pattern.to_regex()
+                stack.extend(node.children())
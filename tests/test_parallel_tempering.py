@@ -0,0 +1,91 @@
+"""Unit tests for the parallel tempering optimizer."""
+
+import math
+
+import pytest
+
+from regexgen.algorithms.parallel_tempering import ParallelTemperingSA, PTConfig, _Replica
+from regexgen.patterns.ast import LiteralNode, PatternAST
+from regexgen.scoring.fitness import FitnessResult, MultiCriteriaScorer
+
+
+def _replica(temperature, score, name):
+    fitness = FitnessResult(
+        total_score=score,
+        correctness_score=score,
+        complexity_score=0.0,
+        readability_score=0.0,
+        performance_score=0.0,
+        positive_matches=0,
+        negative_matches=0,
+        positive_total=0,
+        negative_total=0,
+        evaluation_time_ms=0.0,
+    )
+    return _Replica(temperature, PatternAST(LiteralNode(name)), fitness)
+
+
+def test_replica_temperatures_are_geometric_from_hottest():
+    optimizer = ParallelTemperingSA(PTConfig(
+        num_replicas=4, initial_temperature=8.0, final_temperature=1.0
+    ))
+    assert optimizer.replica_temperatures() == pytest.approx([8.0, 4.0, 2.0, 1.0])
+
+
+def test_better_state_always_moves_to_colder_replica():
+    optimizer = ParallelTemperingSA(PTConfig(random_seed=0))
+    for _ in range(50):
+        hot, cold = _replica(2.0, 0.9, "good"), _replica(1.0, 0.1, "bad")
+        optimizer._attempt_swaps([hot, cold])
+        assert cold.pattern.to_regex() == "good"
+        assert cold.fitness.total_score == 0.9
+        assert hot.pattern.to_regex() == "bad"
+
+
+def test_worse_state_moves_to_colder_replica_with_metropolis_probability():
+    optimizer = ParallelTemperingSA(PTConfig(random_seed=1))
+    trials = 4000
+    swaps = 0
+    for _ in range(trials):
+        hot, cold = _replica(2.0, 0.2, "worse"), _replica(1.0, 1.0, "better")
+        optimizer._attempt_swaps([hot, cold])
+        swaps += cold.pattern.to_regex() == "worse"
+    expected = math.exp((1.0 / 2.0 - 1.0 / 1.0) * (1.0 - 0.2))
+    assert swaps / trials == pytest.approx(expected, abs=0.03)
+
+
+def test_swaps_only_permute_states_between_replicas():
+    optimizer = ParallelTemperingSA(PTConfig(random_seed=2))
+    scores = [0.3, 0.8, 0.1, 0.5]
+    replicas = [_replica(t, s, f"s{i}") for i, (t, s) in enumerate(zip([8, 4, 2, 1], scores))]
+    for _ in range(20):
+        optimizer._attempt_swaps(replicas)
+        assert [r.temperature for r in replicas] == [8, 4, 2, 1]
+        assert sorted(r.fitness.total_score for r in replicas) == sorted(scores)
+        for replica in replicas:
+            assert scores[int(replica.pattern.to_regex()[1:])] == replica.fitness.total_score
+
+
+def test_optimize_stops_on_perfect_initial_pattern():
+    config = PTConfig(max_iterations=60, num_replicas=3, random_seed=4)
+    scorer = MultiCriteriaScorer(result_cache_size=0)
+    result = ParallelTemperingSA(config).optimize(
+        ["abc"], ["xyz"], scorer,
+        initial_pattern=PatternAST(LiteralNode("abc")),
+        early_stop=FitnessResult.is_perfect
+    )
+    assert result.convergence_reason == "early_stop"
+    assert result.best_pattern.to_regex() == "abc"
+
+
+def test_restarts_run_parallel_tempering_chains():
+    config = PTConfig(max_iterations=20, num_replicas=2, swap_every=5, random_seed=3)
+    scorer = MultiCriteriaScorer(result_cache_size=0)
+    result = ParallelTemperingSA(config).optimize_with_restarts(
+        ["abc", "abd"], ["xyz"], scorer, num_restarts=2, max_workers=2
+    )
+    # Plain SA would record a cooling schedule instead of the coldest replica
+    assert result.temperature_history
+    assert result.temperature_history == pytest.approx(
+        [config.final_temperature] * len(result.temperature_history)
+    )
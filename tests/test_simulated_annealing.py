@@ -0,0 +1,119 @@
+"""Unit tests for the simulated annealing optimizer."""
+
+import pytest
+
+from regexgen.algorithms.simulated_annealing import (
+    CoolingSchedule, SAConfig, SimulatedAnnealing, TemperatureScheduler
+)
+from regexgen.patterns.ast import LiteralNode, PatternAST
+from regexgen.scoring.fitness import FitnessResult, FitnessScorer
+
+
+def _fitness(total_score):
+    return FitnessResult(
+        total_score=total_score,
+        correctness_score=total_score,
+        complexity_score=0.0,
+        readability_score=0.0,
+        performance_score=0.0,
+        positive_matches=0,
+        negative_matches=0,
+        positive_total=1,
+        negative_total=1,
+        evaluation_time_ms=0.0,
+    )
+
+
+class _FixedScorer(FitnessScorer):
+    """Scores the literal patterns "current" and "neighbour" with fixed totals."""
+
+    def __init__(self, current, neighbour):
+        self.totals = {"current": current, "neighbour": neighbour}
+
+    def score(self, pattern, positive_examples, negative_examples):
+        return _fitness(self.totals[pattern.to_regex()])
+
+    def score_with_bound(self, pattern, positive_examples, negative_examples, min_required):
+        fitness = self.score(pattern, positive_examples, negative_examples)
+        fitness.pruned = min_required is not None and fitness.total_score < min_required
+        return fitness
+
+
+class _FixedMutator:
+    """Proposes the same neighbour for every pattern."""
+
+    def mutate(self, pattern):
+        return PatternAST(LiteralNode("neighbour"))
+
+
+def _single_step(neighbour_score, prune_margin=5.0):
+    """Run one SA step from a 0.9 pattern at T=0.01; return the result and acceptance calls."""
+    optimizer = SimulatedAnnealing(SAConfig(
+        initial_temperature=0.01, final_temperature=0.001, max_iterations=1,
+        prune_margin=prune_margin, random_seed=0
+    ))
+    optimizer.mutator = _FixedMutator()
+    calls = []
+
+    def accept(current_score, neighbor_score, temperature):
+        calls.append((current_score, neighbor_score))
+        return True
+
+    optimizer._should_accept = accept
+    result = optimizer.optimize(
+        ["a"], ["b"], _FixedScorer(0.9, neighbour_score),
+        initial_pattern=PatternAST(LiteralNode("current"))
+    )
+    return result, calls
+
+
+def test_pruned_neighbour_is_rejected_without_metropolis_test():
+    # 0.5 is below 0.9 - 5.0 * 0.01
+    result, calls = _single_step(0.5)
+    assert calls == []
+    assert (result.accepted_moves, result.rejected_moves) == (0, 1)
+    assert result.best_pattern.to_regex() == "current"
+
+
+def test_neighbour_inside_prune_margin_goes_through_metropolis_test():
+    result, calls = _single_step(0.87)
+    assert calls == [(0.9, pytest.approx(0.87))]
+    assert result.accepted_moves == 1
+
+
+def test_without_prune_margin_every_neighbour_gets_metropolis_test():
+    result, calls = _single_step(0.5, prune_margin=None)
+    assert calls == [(0.9, pytest.approx(0.5))]
+    assert result.accepted_moves == 1
+
+
+def _acceptance_schedule():
+    return TemperatureScheduler(SAConfig(
+        cooling_schedule=CoolingSchedule.ACCEPTANCE_ADAPTIVE, initial_temperature=10.0,
+        final_temperature=0.01, max_iterations=100, max_no_improvement=40
+    ))
+
+
+def _temperatures(acceptance_rate, steps, last_improvement=None):
+    scheduler = _acceptance_schedule()
+    return [
+        scheduler.get_temperature(
+            iteration, iteration if last_improvement is None else last_improvement, acceptance_rate
+        )
+        for iteration in range(steps)
+    ]
+
+
+def test_low_acceptance_keeps_temperature_higher_than_high_acceptance():
+    low, neutral, high = (_temperatures(rate, 50)[-1] for rate in (0.05, 0.5, 0.95))
+    assert low > neutral > high
+
+
+def test_stagnation_reheats_once_per_improvement():
+    # Stagnation exceeds max_no_improvement // 2 at iteration 21
+    temperatures = _temperatures(0.5, 60, last_improvement=0)
+    for iteration in range(1, 60):
+        if iteration == 21:
+            assert temperatures[iteration] > temperatures[iteration - 1]
+        else:
+            assert temperatures[iteration] < temperatures[iteration - 1]
@@ -0,0 +1,68 @@
+"""Unit tests for interval-timer timeouts."""
+
+import signal
+import time
+
+import pytest
+
+from regexgen.timeouts import call_with_timeout, timeout_available
+
+
+pytestmark = pytest.mark.skipif(not timeout_available(), reason="needs SIGALRM on the main thread")
+
+
+def _spin(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+def test_returns_result_within_timeout():
+    assert call_with_timeout(1.0, sum, [1, 2, 3]) == 6
+
+
+def test_raises_timeout_error_when_call_overruns():
+    with pytest.raises(TimeoutError):
+        call_with_timeout(0.01, _spin, 5.0)
+
+
+def test_timer_that_fires_at_once_still_restores_handler():
+    previous = signal.getsignal(signal.SIGALRM)
+    for _ in range(50):
+        with pytest.raises(TimeoutError):
+            call_with_timeout(1e-6, _spin, 5.0)
+        assert signal.getsignal(signal.SIGALRM) is previous
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+
+def test_restores_previous_handler_and_timer():
+    fired = []
+
+    def outer_handler(signum, frame):
+        fired.append(signum)
+
+    previous = signal.signal(signal.SIGALRM, outer_handler)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 30.0)
+        with pytest.raises(TimeoutError):
+            call_with_timeout(0.01, _spin, 5.0)
+        assert signal.getsignal(signal.SIGALRM) is outer_handler
+        remaining, _ = signal.getitimer(signal.ITIMER_REAL)
+        assert 20.0 < remaining <= 30.0
+        assert fired == []
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def test_outer_timer_that_expired_during_call_still_fires():
+    fired = []
+    previous = signal.signal(signal.SIGALRM, lambda signum, frame: fired.append(signum))
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 0.01)
+        call_with_timeout(1.0, _spin, 0.05)
+        _spin(0.05)
+        assert fired == [signal.SIGALRM]
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -0,0 +1,288 @@
+"""Unit tests for pattern validation."""
+
+import pickle
+import re
+import time
+
+import pytest
+
+from regexgen.patterns.ast import (
+    AlternationNode, CharacterClassNode, GroupNode, LiteralNode, PatternAST, QuantifierNode,
+    WildcardNode, char_mask
+)
+from regexgen.patterns.mutations import PatternMutator
+from regexgen.validation import validator as validator_module
+from regexgen.validation.validator import PatternValidator, ValidationResult
+
+
+def _result_from_lists(**overrides):
+    fields = dict(
+        is_valid=False,
+        regex_string="[ab]",
+        compilation_error=None,
+        positive_matches=["a", "b"],
+        positive_failures=["c"],
+        negative_matches=["a"],
+        negative_failures=["d"],
+        execution_time_ms=0.0,
+        pattern_length=4,
+        pattern_complexity=4,
+        timeout_occurred=False,
+        performance_warnings=[],
+    )
+    fields.update(overrides)
+    return ValidationResult(**fields)
+
+
+def test_validation_result_keeps_list_constructor():
+    result = _result_from_lists()
+    assert result.positive_matches == ["a", "b"]
+    assert result.positive_failures == ["c"]
+    assert result.negative_matches == ["a"]
+    assert result.negative_failures == ["d"]
+    assert (result.positive_match_count, result.positive_failure_count) == (2, 1)
+    assert (result.negative_match_count, result.negative_failure_count) == (1, 1)
+
+
+def test_validation_result_from_masks_selects_examples_by_bit():
+    result = ValidationResult.from_masks(
+        is_valid=False,
+        regex_string="[ab]",
+        compilation_error=None,
+        positive_examples=["c", "a", "b"],
+        negative_examples=["d", "a"],
+        positive_match_mask=0b110,
+        negative_match_mask=0b10,
+        execution_time_ms=0.0,
+        pattern_length=4,
+        pattern_complexity=4,
+        timeout_occurred=False,
+        performance_warnings=[],
+    )
+    assert result.positive_matches == ["a", "b"]
+    assert result.positive_failures == ["c"]
+    assert result.negative_matches == ["a"]
+    assert result.negative_failures == ["d"]
+    assert result == _result_from_lists()
+
+
+def test_validate_masks_follow_fullmatch_per_example():
+    validator = PatternValidator()
+    pattern = PatternAST(QuantifierNode(CharacterClassNode(frozenset("ab")), 1, 3))
+    positives = ["a", "abc", "ab", "", "bbb", "abab"]
+    negatives = ["b", "c", "aaaa"]
+    result = validator.validate(pattern, positives, negatives)
+    compiled = re.compile(pattern.to_regex())
+    for index, example in enumerate(positives):
+        assert bool(result.positive_match_mask >> index & 1) == bool(compiled.fullmatch(example))
+    for index, example in enumerate(negatives):
+        assert bool(result.negative_match_mask >> index & 1) == bool(compiled.fullmatch(example))
+    assert result.positive_failures == ["abc", "", "abab"]
+    assert result.negative_matches == ["b"]
+
+
+def test_validation_result_survives_pickling():
+    result = PatternValidator().validate(PatternAST(LiteralNode("a")), ["a", "b"], ["c"])
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_char_mask_sets_one_bit_per_latin1_character():
+    assert char_mask("a") == 1 << ord("a")
+    assert char_mask("ab") == (1 << ord("a")) | (1 << ord("b"))
+    # Everything above Latin-1 shares one bit
+    assert char_mask("\u4e00") == char_mask("\u20ac") == 1 << 256
+
+
+def test_first_mask_is_any_for_wildcards_and_negated_classes():
+    assert PatternAST(WildcardNode()).first_mask() == -1
+    assert PatternAST(CharacterClassNode(frozenset("ab"), negated=True)).first_mask() == -1
+    alternation = AlternationNode([LiteralNode("ab"), LiteralNode("cd")])
+    assert PatternAST(alternation).first_mask() == char_mask("ac")
+
+
+def test_first_mask_covers_first_character_of_every_match():
+    mutator = PatternMutator(seed=9)
+    examples = ["abc123", "foo_bar", "x-y", "2024-01-02", "hello world", "Zz"]
+    patterns = [mutator.generate_random_pattern(max_complexity=20, examples=examples)
+                for _ in range(50)]
+    for _ in range(10):
+        patterns = [mutator.mutate(pattern) for pattern in patterns]
+        for pattern in patterns:
+            try:
+                compiled = re.compile(pattern.to_regex())
+            except re.error:
+                continue
+            mask = pattern.first_mask()
+            for example in examples:
+                if example and compiled.fullmatch(example):
+                    assert mask & char_mask(example[0]), pattern.to_regex()
+
+
+def test_first_character_rejection_reports_real_masks():
+    validator = PatternValidator()
+    pattern = PatternAST(CharacterClassNode(frozenset("ab")))
+    positives = ["a", "c", "b"]
+    negatives = ["d", "a"]
+    assert not validator.passes(pattern, positives, negatives)
+    result = validator.validate(pattern, positives, negatives)
+    assert not result.is_valid
+    assert result.positive_matches == ["a", "b"]
+    assert result.positive_failures == ["c"]
+    assert result.negative_matches == ["a"]
+
+
+def test_validate_matches_only_examples_the_pattern_can_start_on():
+    validator = PatternValidator()
+    matched = []
+    test_pattern_bits = validator._test_pattern_bits
+
+    def recording_bits(compiled_pattern, positives, negatives, early_exit=False):
+        matched.extend(positives)
+        matched.extend(negatives)
+        return test_pattern_bits(compiled_pattern, positives, negatives, early_exit)
+
+    validator._test_pattern_bits = recording_bits
+    pattern = PatternAST(QuantifierNode(CharacterClassNode(frozenset("ab")), 0, None))
+    result = validator.validate(pattern, ["ab", "cb", "", "ba"], ["d", "aac", "x"])
+    assert sorted(matched) == ["", "aac", "ab", "ba"]
+    assert result.positive_failures == ["cb"]
+    assert result.negative_failures == ["d", "aac", "x"]
+
+
+def test_range_between_strings_fails_instead_of_raising():
+    pattern = PatternAST(CharacterClassNode(frozenset(), ranges=(("a", "bc"),)))
+    validator = PatternValidator()
+    assert not validator.passes(pattern, ["a"], ["d"])
+    result = validator.validate(pattern, ["a"], ["d"])
+    assert not result.is_valid
+    assert "not between single characters" in result.compilation_error
+
+
+def _repeated_group(child, min_count):
+    return PatternAST(QuantifierNode(GroupNode(child, capturing=False), min_count, None))
+
+
+def test_nested_variable_repetition_is_flagged():
+    validator = PatternValidator()
+    assert validator._is_redos_prone(_repeated_group(QuantifierNode(LiteralNode("a"), 1, None), 1))
+    assert not validator._is_redos_prone(_repeated_group(QuantifierNode(LiteralNode("a"), 2, 2), 1))
+
+
+def test_attack_string_confirms_exponential_backtracking():
+    validator = PatternValidator()
+    pattern = _repeated_group(QuantifierNode(LiteralNode("a"), 1, None), 1)
+    assert validator._build_attack_string(pattern) == "a" * 20 + "\n"
+    assert validator._is_redos_prone(pattern)
+
+
+def test_attack_string_clears_statically_flagged_linear_patterns(monkeypatch):
+    # (a|ab)* is flagged by the AST check but only backtracks polynomially;
+    # a generous timer keeps a loaded machine from confirming it
+    monkeypatch.setattr(validator_module, "_ATTACK_TIMEOUT_SECONDS", 1.0)
+    validator = PatternValidator()
+    pattern = _repeated_group(AlternationNode([LiteralNode("a"), LiteralNode("ab")]), 0)
+    assert validator._ambiguous_chars(pattern.root) == {"a"}
+    assert not validator._is_redos_prone(pattern)
+
+
+def test_confirmed_attack_never_waits_for_the_full_timeout(monkeypatch):
+    budgets = []
+    call_with_timeout = validator_module.call_with_timeout
+
+    def recording_call(seconds, function, *args):
+        budgets.append(seconds)
+        return call_with_timeout(seconds, function, *args)
+
+    monkeypatch.setattr(validator_module, "call_with_timeout", recording_call)
+    validator = PatternValidator(timeout_seconds=60.0)
+    pattern = _repeated_group(QuantifierNode(LiteralNode("a"), 1, None), 1)
+    assert not validator.validate(pattern, ["a" * 40 + "b"], ["x"]).is_valid
+    assert not validator.passes(pattern, ["a"], ["x"])
+    assert budgets and 60.0 not in budgets
+
+
+def test_unambiguous_repetition_is_not_flagged():
+    validator = PatternValidator()
+    pattern = _repeated_group(AlternationNode([LiteralNode("a"), LiteralNode("b")]), 0)
+    assert validator._ambiguous_chars(pattern.root) is None
+    assert not validator._is_redos_prone(pattern)
+
+
+def test_redos_prone_pattern_is_invalid_with_real_masks(monkeypatch):
+    # A longer attack still overruns a budget generous enough for the examples
+    monkeypatch.setattr(validator_module, "_ATTACK_REPEAT", 30)
+    monkeypatch.setattr(validator_module, "_ATTACK_TIMEOUT_SECONDS", 1.0)
+    validator = PatternValidator()
+    pattern = _repeated_group(QuantifierNode(LiteralNode("a"), 1, None), 1)
+    result = validator.validate(pattern, ["a", "aa", "b"], ["x"])
+    assert not result.is_valid
+    assert result.performance_warnings
+    assert result.positive_matches == ["a", "aa"]
+    assert result.negative_failures == ["x"]
+    assert not validator.passes(pattern, ["a", "aa"], ["x"])
+
+
+def test_redos_prone_pattern_is_matched_under_attack_budget():
+    # Matching the examples under the full minute would wait out the backtrack
+    validator = PatternValidator(timeout_seconds=60.0)
+    pattern = _repeated_group(QuantifierNode(LiteralNode("a"), 1, None), 1)
+    result = validator.validate(pattern, ["a" * 40 + "b"], ["x"])
+    assert not result.is_valid
+    assert result.timeout_occurred
+    assert result.execution_time_ms < 30_000
+
+
+def _pool_candidates(validator, seed=4):
+    # Unambiguous patterns only, so no result depends on a timer
+    mutator = PatternMutator(seed=seed)
+    examples = ["abc123", "foo_bar", "x-y", "2024-01-02"]
+    patterns = [mutator.mutate(mutator.generate_random_pattern(max_complexity=20, examples=examples))
+                for _ in range(40)]
+    return [pattern for pattern in patterns if validator._ambiguous_chars(pattern.root) is None]
+
+
+def _outcome(result):
+    return (result.regex_string, result.is_valid, result.compilation_error,
+            result.positive_match_mask, result.negative_match_mask)
+
+
+def test_validate_many_equals_serial_validation_in_input_order():
+    positives, negatives = ["abc123", "foo_bar", "x-y"], ["abc", "2024/01/02", " "]
+    validator = PatternValidator(max_workers=2)
+    candidates = _pool_candidates(validator)
+    try:
+        pooled = validator.validate_many(candidates, positives, negatives)
+    finally:
+        validator.close()
+    serial = PatternValidator().validate_batch(candidates, positives, negatives)
+    assert list(map(_outcome, pooled)) == list(map(_outcome, serial))
+
+
+def test_validate_many_rebuilds_pool_when_examples_change():
+    positives, negatives = ["abc123", "foo_bar", "x-y"], ["abc", "2024/01/02", " "]
+    validator = PatternValidator(max_workers=2)
+    candidates = _pool_candidates(validator)
+    try:
+        validator.validate_many(candidates, positives, negatives)
+        pool = validator._pool
+        validator.validate_many(_pool_candidates(validator, seed=5), positives, negatives)
+        assert validator._pool is pool
+        swapped = validator.validate_many(candidates, negatives, positives)
+        assert validator._pool is not pool
+    finally:
+        validator.close()
+    serial = PatternValidator().validate_batch(candidates, negatives, positives)
+    assert list(map(_outcome, swapped)) == list(map(_outcome, serial))
+
+
+def test_thread_timeout_drops_only_the_timeout_worker(monkeypatch):
+    monkeypatch.setattr(validator_module, "timeout_available", lambda: False)
+    validator = PatternValidator(timeout_seconds=0.05)
+    validator._test_pattern_bits = lambda *args: time.sleep(0.5)
+    pool = object()
+    validator._pool = pool
+    with pytest.raises(TimeoutError):
+        validator._test_pattern_with_timeout(re.compile("a"), ["a"], [])
+    assert validator._executor is None
+    assert validator._pool is pool
+    validator._pool = None